@@ -0,0 +1,124 @@
+#Batch_routing:_many_start/target_pairs_with_one_search_tree_per_source
+import time
+from array import array
+from pathfinding_core import load_maze
+from route_table import bfs_next_hops, AT_TARGET, UNREACHABLE
+
+class BatchResult:
+    """
+    Paths for a batch of queries stored back to back in one flat array of grid
+    indices: query k owns cells[offsets[k]:offsets[k + 1]] (empty if unreachable).
+    timings[k] is the seconds spent on query k, its share of its source's search
+    tree plus walking its own path out of that tree.
+    """
+
+    def __init__(self, stride, cells, offsets, timings):
+        self.stride = stride
+        self.cells = cells
+        self.offsets = offsets
+        self.timings = timings
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def length(self, k):
+        """Steps in path k, or -1 if there is no route."""
+        return self.offsets[k + 1] - self.offsets[k] - 1
+
+    def path(self, k):
+        return [(i // self.stride - 1, i % self.stride - 1) for i in self.cells[self.offsets[k]:self.offsets[k + 1]]]
+
+    def paths(self):
+        return [self.path(k) for k in range(len(self))]
+
+# Accept (x, y) cells or node names
+def resolve(point, nodes):
+    if isinstance(point, str):
+        if not nodes or point not in nodes:
+            raise ValueError(f"Unknown node: {point}")
+        return tuple(nodes[point])
+    return tuple(point)
+
+def solve_source(grid, source, group):
+    """
+    Grow one breadth-first tree from `source` and read off the path to every target
+    of `group`, a list of (query index, target). Returns (query index, grid indices
+    of the path, seconds) triples; the path is empty if the target is unreachable,
+    and every path is empty if the source is outside the grid. A source on a wall
+    steps out through its open neighbours, as A* does.
+    """
+    if not grid.in_bounds(source):
+        return [(k, [], 0.0) for k, _ in group]
+    started = time.perf_counter()
+    targets = {grid.index(target) for _, target in group if grid.in_bounds(target)}
+    # The tree's next hops lead back to the source, so each path is read from the target end
+    next_hop, _ = bfs_next_hops(grid, source, targets)
+    shared = (time.perf_counter() - started) / len(group)
+
+    offsets = grid.offsets
+    solved = []
+    for k, target in group:
+        started = time.perf_counter()
+        cells = []
+        if grid.in_bounds(target) and next_hop[grid.index(target)] != UNREACHABLE:
+            current = grid.index(target)
+            cells.append(current)
+            while next_hop[current] != AT_TARGET:
+                current += offsets[next_hop[current]]
+                cells.append(current)
+            cells.reverse()
+        solved.append((k, cells, shared + time.perf_counter() - started))
+    return solved
+
+# Query indices grouped by start cell, in first-seen order
+def group_by_source(queries):
+    by_source = {}
+    for k, (start, target) in enumerate(queries):
+        by_source.setdefault(start, []).append((k, target))
+    return by_source
+
+def collect(stride, count, solved):
+    """Pack (query index, cells, seconds) triples, in any order, into a BatchResult."""
+    found = [[] for _ in range(count)]
+    timings = [0.0] * count
+    for k, cells, seconds in solved:
+        found[k] = cells
+        timings[k] = seconds
+    flat = array("i")
+    bounds = array("i", [0])
+    for cells in found:
+        flat.extend(cells)
+        bounds.append(len(flat))
+    return BatchResult(stride, flat, bounds, timings)
+
+def route_batch(grid, pairs, nodes=None):
+    """
+    Solve every (start, target) pair in `pairs`; each side is a cell or a node name.
+    Pairs are grouped by start and one breadth-first tree is grown per distinct
+    start, stopping once all of that start's targets are reached.
+    """
+    queries = [(resolve(start, nodes), resolve(target, nodes)) for start, target in pairs]
+    solved = []
+    for source, group in group_by_source(queries).items():
+        solved.extend(solve_source(grid, source, group))
+    return collect(grid.stride, len(queries), solved)
+
+def main():
+    grid, start, target, nodes = load_maze()
+    pairs = [(a, b) for a in nodes for b in nodes if a != b]
+
+    started = time.perf_counter()
+    result = route_batch(grid, pairs, nodes)
+    batch_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for a, b in pairs:
+        grid.a_star(nodes[a], nodes[b])
+    single_time = time.perf_counter() - started
+
+    unreachable = sum(1 for k in range(len(result)) if result.length(k) < 0)
+    print(f"{len(pairs)} routes from {len(nodes)} sources: batch {batch_time * 1000:.1f} ms, one A* per pair {single_time * 1000:.1f} ms")
+    print(f"Unreachable: {unreachable}, slowest query {max(result.timings, default=0) * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#Bidirectional_A*_from_both_ends_of_a_route
+import heapq
+
+def bidirectional_search(grid, start, target):
+    """
+    Return a shortest path from start to target (both included), or [] if unreachable.
+    A* runs forwards from the start (towards the target) and backwards from the target
+    (towards the start), always growing the smaller frontier. `best` is the shortest
+    route seen through a cell reached by both searches; no undiscovered route can be
+    shorter than the smallest f on either open list, so the search stops once either
+    of them reaches `best`.
+    """
+    grid.stats = {"expansions": 0, "pushes": 0, "stale_pops": 0}
+    if not grid.in_bounds(start) or not grid.in_bounds(target):
+        return []
+    cells = grid.cells
+    offsets = grid.offsets
+    stride = grid.stride
+    size = grid.size
+    source = grid.index(start)
+    goal = grid.index(target)
+    if source == goal:
+        return [start]
+    if cells[goal]:
+        return []
+
+    sx, sy = divmod(source, stride)
+    tx, ty = divmod(goal, stride)
+    distance = abs(sx - tx) + abs(sy - ty)
+    # Per direction: g scores, parents, closed set, open list and the cell it heads for
+    forward = ({source: 0}, {}, set(), [distance * size + source], tx, ty)
+    backward = ({goal: 0}, {}, set(), [distance * size + goal], sx, sy)
+    best = None
+    meeting = -1
+    expansions, pushes, stale_pops = 0, 2, 0
+
+    while forward[3] and backward[3]:
+        if best is not None and max(forward[3][0], backward[3][0]) // size >= best:
+            break
+        side, other = (forward, backward) if len(forward[3]) <= len(backward[3]) else (backward, forward)
+        g_score, came_from, closed, open_list, hx, hy = side
+        current = heapq.heappop(open_list) % size
+        if current in closed:
+            stale_pops += 1
+            continue
+        closed.add(current)
+        expansions += 1
+
+        other_g = other[0]
+        tentative_g_score = g_score[current] + 1
+        for offset in offsets:
+            neighbor = current + offset
+            # Only the start may be a wall (A* lets a walker step out of one); the backward search reaches it last
+            if neighbor in closed or (cells[neighbor] and not (neighbor == source and side is backward)):
+                continue
+            if tentative_g_score < g_score.get(neighbor, tentative_g_score + 1):
+                g_score[neighbor] = tentative_g_score
+                came_from[neighbor] = current
+                nx, ny = divmod(neighbor, stride)
+                heapq.heappush(open_list, (tentative_g_score + abs(nx - hx) + abs(ny - hy)) * size + neighbor)
+                pushes += 1
+                if neighbor in other_g and (best is None or tentative_g_score + other_g[neighbor] < best):
+                    best = tentative_g_score + other_g[neighbor]
+                    meeting = neighbor
+
+    grid.stats = {"expansions": expansions, "pushes": pushes, "stale_pops": stale_pops}
+    if best is None:
+        return []
+
+    path = [meeting]
+    while path[-1] != source:
+        path.append(forward[1][path[-1]])
+    path.reverse()
+    current = meeting
+    while current != goal:
+        current = backward[1][current]
+        path.append(current)
+    return [(i // stride - 1, i % stride - 1) for i in path]
@@ -0,0 +1,175 @@
+#Multi-floor_buildings:_floors_linked_by_stairs/elevator/ramp_portals
+import heapq
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathfinding_core import load_maze
+from route_table import bfs_next_hops
+
+# Building file layout (JSON):
+#   floors   {floor name: maze file, relative to the building file (.json or .maze)}
+#   portals  [{"name", "kind" ("stairs", "elevator", "ramp"), "from": [floor, x, y],
+#              "to": [floor, x, y], "cost": steps, "accessible": bool,
+#              "bidirectional": bool (default true)}]
+# Positions everywhere are (floor, x, y) with the floor given by its name.
+
+class Building:
+    """
+    Floors are loaded on demand and at most `max_loaded_floors` grids are kept in
+    memory, least recently used first out. Walking distances between the portals
+    of a floor are worked out the first time that floor is loaded and kept after
+    the grid itself is dropped.
+    """
+
+    def __init__(self, filename, max_loaded_floors=4):
+        with open(filename, "r") as file:
+            data = json.load(file)
+        folder = os.path.dirname(os.path.abspath(filename))
+        self.floor_files = {str(name): os.path.join(folder, path) for name, path in data["floors"].items()}
+        self.max_loaded_floors = max_loaded_floors
+        self.loaded = OrderedDict()
+        self.portal_distances = {}
+
+        # Portal links leaving each (floor, x, y) endpoint
+        self.links = {}
+        for portal in data.get("portals", []):
+            a = (str(portal["from"][0]), portal["from"][1], portal["from"][2])
+            b = (str(portal["to"][0]), portal["to"][1], portal["to"][2])
+            link = {"name": portal.get("name", ""), "kind": portal.get("kind", "stairs"),
+                    "cost": portal.get("cost", 1), "accessible": portal.get("accessible", True)}
+            self.links.setdefault(a, []).append(dict(link, to=b))
+            if portal.get("bidirectional", True):
+                self.links.setdefault(b, []).append(dict(link, to=a))
+        self.endpoints = {}
+        for position in self.links:
+            self.endpoints.setdefault(position[0], []).append(position)
+
+    def floor(self, name):
+        """(grid, nodes) of a floor, loading it if needed."""
+        if name in self.loaded:
+            self.loaded.move_to_end(name)
+            return self.loaded[name]
+        if name not in self.floor_files:
+            raise ValueError(f"Unknown floor: {name}")
+        grid, _, _, nodes = load_maze(self.floor_files[name])
+        self.loaded[name] = (grid, nodes)
+        if len(self.loaded) > self.max_loaded_floors:
+            self.loaded.popitem(last=False)
+        if name not in self.portal_distances:
+            self.portal_distances[name] = {position: self.distances_from(grid, position) for position in self.endpoints.get(name, [])}
+        return grid, nodes
+
+    def node(self, floor, name):
+        """(floor, x, y) of a named node on a floor."""
+        x, y = self.floor(floor)[1][name]
+        return floor, x, y
+
+    def distances_from(self, grid, position):
+        """Walking distance on one floor from `position` to every portal endpoint of that floor it reaches."""
+        floor = position[0]
+        others = [other for other in self.endpoints.get(floor, []) if grid.in_bounds(other[1:])]
+        if not grid.in_bounds(position[1:]):
+            return {}
+        _, distance = bfs_next_hops(grid, position[1:], [grid.index(other[1:]) for other in others])
+        found = {}
+        for other in others:
+            steps = distance[grid.index(other[1:])]
+            if steps >= 0:
+                found[other] = steps
+        return found
+
+    def route(self, start, target, accessible_only=False):
+        """
+        Shortest route between two (floor, x, y) positions, as (path, cost) where the
+        path lists (floor, x, y) steps and a portal appears as a jump between floors.
+        Returns ([], -1) if there is none. With accessible_only, portals not flagged
+        accessible (e.g. stairs) are skipped. Only floors the route search reaches
+        are loaded.
+        """
+        start = (str(start[0]), start[1], start[2])
+        target = (str(target[0]), target[1], target[2])
+        grid, _ = self.floor(start[0])
+        # Walking legs on a floor run between the start, the target and portal endpoints
+        first = self.distances_from(grid, start)
+        if start[0] == target[0]:
+            direct = grid.a_star(start[1:], target[1:])
+            if direct:
+                first[target] = len(direct) - 1
+        # Floors are undirected: the walk from an endpoint to the target is the target's walk to it
+        last = self.distances_from(self.floor(target[0])[0], target)
+
+        g_score = {start: 0}
+        came_from = {}
+        closed = set()
+        open_list = [(0, start)]
+        while open_list:
+            cost, current = heapq.heappop(open_list)
+            if current in closed:
+                continue
+            closed.add(current)
+            if current == target:
+                break
+            if current == start:
+                walks = first
+            else:
+                if current[0] not in self.portal_distances:
+                    self.floor(current[0])
+                walks = self.portal_distances[current[0]].get(current, {})
+            moves = [(position, steps, None) for position, steps in walks.items()]
+            if current in last:
+                moves.append((target, last[current], None))
+            moves.extend((link["to"], link["cost"], link) for link in self.links.get(current, [])
+                         if link["accessible"] or not accessible_only)
+            for position, steps, link in moves:
+                tentative = cost + steps
+                if position not in closed and tentative < g_score.get(position, tentative + 1):
+                    g_score[position] = tentative
+                    came_from[position] = (current, link)
+                    heapq.heappush(open_list, (tentative, position))
+        if target not in closed:
+            return [], -1
+
+        legs = [target]
+        while legs[-1] != start:
+            legs.append(came_from[legs[-1]][0])
+        legs.reverse()
+
+        # Refine each walking leg on its own floor
+        path = [start]
+        for a, b in zip(legs, legs[1:]):
+            if came_from[b][1] is not None:
+                path.append(b)
+                continue
+            walk = self.floor(a[0])[0].a_star(a[1:], b[1:])
+            path.extend((a[0], x, y) for x, y in walk[1:])
+        return path, g_score[target]
+
+    def describe_portals(self, path):
+        """Portal names and kinds used along a route, in order."""
+        used = []
+        for a, b in zip(path, path[1:]):
+            if a[0] != b[0]:
+                for link in self.links.get(a, []):
+                    if link["to"] == b:
+                        used.append((link["name"], link["kind"]))
+                        break
+        return used
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "building.json"
+    building = Building(filename)
+    floors = list(building.floor_files)
+    start = building.node(floors[0], sys.argv[2]) if len(sys.argv) > 2 else building.node(floors[0], "502a")
+    target = building.node(floors[-1], sys.argv[3]) if len(sys.argv) > 3 else building.node(floors[-1], "dean")
+    for accessible_only in (False, True):
+        path, cost = building.route(start, target, accessible_only)
+        label = "step-free" if accessible_only else "any"
+        if not path:
+            print(f"{label}: no route from {start} to {target}")
+            continue
+        portals = ", ".join(f"{name} ({kind})" for name, kind in building.describe_portals(path))
+        print(f"{label}: {cost} steps from {start} to {target} via {portals or 'no portals'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#Nearest-path-point_lookup_and_Left/Right/Straight_classification
+import numpy as np
+
+class DirectionField:
+    """
+    Manhattan distance transform of a path over the whole board, with the index of
+    the nearest path point for every cell. Built once per path with four vectorized
+    sweeps (L1 distance is separable: nearest source along x within each row, then
+    along y), after which each node's closest path point is a single lookup.
+    """
+
+    def __init__(self, path, width, height):
+        self.path = np.array(path, dtype=np.int64).reshape(-1, 2)
+        self.width = width
+        self.height = height
+        unreached = width + height + 1
+        distance = np.full((width, height), unreached, dtype=np.int64)
+        label = np.full((width, height), -1, dtype=np.int64)
+
+        inside = [i for i, (x, y) in enumerate(path) if 0 <= x < width and 0 <= y < height]
+        # Seed in reverse so the earliest path index wins when a cell repeats
+        for i in reversed(inside):
+            distance[path[i][0], path[i][1]] = 0
+            label[path[i][0], path[i][1]] = i
+
+        # Sweeps along x then y; each step relaxes a whole row/column at once
+        for axis in (0, 1):
+            length = distance.shape[axis]
+            for order in (range(1, length), range(length - 2, -1, -1)):
+                for k in order:
+                    previous = k - 1 if order.step == 1 else k + 1
+                    here = (slice(None),) * axis + (k,)
+                    there = (slice(None),) * axis + (previous,)
+                    candidate = distance[there] + 1
+                    closer = candidate < distance[here]
+                    distance[here] = np.where(closer, candidate, distance[here])
+                    label[here] = np.where(closer, label[there], label[here])
+
+        self.distance = distance
+        self.label = label
+
+    def closest_point(self, node):
+        x, y = node
+        if not (0 <= x < self.width and 0 <= y < self.height) or self.label[x, y] < 0:
+            return None
+        return tuple(int(v) for v in self.path[self.label[x, y]])
+
+    def direction(self, node):
+        """Movement direction of `node` relative to the path: "Straight", "Left", "Right" or "Unknown"."""
+        closest = self.closest_point(node)
+        if closest is None:
+            return "Unknown"
+        if closest == tuple(node):
+            return "Straight"  # Node is part of the path → Straight
+        dx = node[0] - closest[0]
+        dy = node[1] - closest[1]
+        if abs(dx) > abs(dy):  # Greater difference in X → Left/Right
+            return "Left" if dx < 0 else "Right"
+        return "Left" if dy < 0 else "Right"
+
+    def directions(self, nodes):
+        """Classify every node of a {name: (x, y)} dict in one vectorized pass."""
+        if not nodes:
+            return {}
+        coords = np.array(list(nodes.values()), dtype=np.int64).reshape(-1, 2)
+        xs, ys = coords[:, 0], coords[:, 1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        labels = np.full(len(coords), -1, dtype=np.int64)
+        labels[inside] = self.label[xs[inside], ys[inside]]
+        known = labels >= 0
+
+        closest = self.path[np.where(known, labels, 0)] if len(self.path) else coords
+        dx = xs - closest[:, 0]
+        dy = ys - closest[:, 1]
+        negative = np.where(np.abs(dx) > np.abs(dy), dx < 0, dy < 0)
+        result = np.where(negative, "Left", "Right").astype(object)
+        result[(dx == 0) & (dy == 0)] = "Straight"
+        result[~known] = "Unknown"
+        return dict(zip(nodes, result.tolist()))
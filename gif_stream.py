@@ -0,0 +1,103 @@
+#Streaming_GIF_writer:_frames_go_to_disk_as_they_are_drawn
+import io
+import numpy as np
+from PIL import Image
+
+class GifWriter:
+    """
+    Animated GIF written one frame at a time, so memory use does not grow with the
+    number of frames. Only the previous frame is kept: each new frame is compared
+    with it and just the rectangle that changed is encoded (by Pillow) and appended,
+    drawn over the frames before it. Frames are arrays in Image.fromarray layout.
+
+    with GifWriter("route.gif", duration=200) as gif:
+        for frame in frames:
+            gif.add_frame(frame)
+    """
+
+    def __init__(self, filename, duration=200, loop=0):
+        self.file = open(filename, "wb")
+        self.duration = duration
+        self.loop = loop
+        self.previous = None
+        self.frame_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_frame(self, frame):
+        frame = np.asarray(frame, dtype=np.uint8)
+        if self.previous is None:
+            self.write_header(frame.shape[1], frame.shape[0])
+            left, top, patch = 0, 0, frame
+        else:
+            changed = np.any(frame != self.previous, axis=2)
+            rows = np.flatnonzero(changed.any(axis=1))
+            columns = np.flatnonzero(changed.any(axis=0))
+            if len(rows):
+                top, left = rows[0], columns[0]
+                patch = frame[top:rows[-1] + 1, left:columns[-1] + 1]
+            else:
+                # Unchanged frame: a single repeated pixel still holds it on screen
+                left, top, patch = 0, 0, frame[:1, :1]
+        self.write_image(int(left), int(top), patch)
+        self.previous = frame.copy()
+        self.frame_count += 1
+
+    def write_header(self, width, height):
+        # Logical screen without a global color table; every frame brings its own
+        self.file.write(b"GIF89a" + width.to_bytes(2, "little") + height.to_bytes(2, "little") + b"\x00\x00\x00")
+        # NETSCAPE2.0 application extension: repeat count (0 = forever)
+        self.file.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + self.loop.to_bytes(2, "little") + b"\x00")
+
+    def write_image(self, left, top, patch):
+        table, size_bits, image_data = encode_patch(patch)
+        delay = int(round(self.duration / 10))
+        # Graphic control extension: disposal 1 leaves this frame under the next one
+        self.file.write(b"\x21\xf9\x04\x04" + delay.to_bytes(2, "little") + b"\x00\x00")
+        height, width = patch.shape[:2]
+        self.file.write(b"\x2c" + left.to_bytes(2, "little") + top.to_bytes(2, "little") +
+                        width.to_bytes(2, "little") + height.to_bytes(2, "little") + bytes([0x80 | size_bits]))
+        self.file.write(table)
+        self.file.write(image_data)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.write(b"\x3b")
+            self.file.close()
+
+def encode_patch(patch):
+    """
+    Encode one image with Pillow and take it apart: returns its color table, the
+    table's size bits and the LZW image data (code size byte through the block
+    terminator), ready to be placed in another GIF as a local color table and image.
+    """
+    buffer = io.BytesIO()
+    Image.fromarray(patch).save(buffer, "GIF", interlace=False)
+    data = buffer.getvalue()
+    position = 13
+    table, size_bits = b"", 0
+    if data[10] & 0x80:
+        size_bits = data[10] & 0x07
+        table = data[position:position + (3 << (size_bits + 1))]
+        position += len(table)
+    # Skip extensions up to the image descriptor
+    while data[position] == 0x21:
+        position += 2
+        while data[position]:
+            position += data[position] + 1
+        position += 1
+    packed = data[position + 9]
+    position += 10
+    if packed & 0x80:
+        size_bits = packed & 0x07
+        table = data[position:position + (3 << (size_bits + 1))]
+        position += len(table)
+    start = position
+    position += 1
+    while data[position]:
+        position += data[position] + 1
+    return table, size_bits, data[start:position + 1]
@@ -0,0 +1,253 @@
+#Hierarchical_pathfinding_(HPA*)_over_square_clusters_of_the_grid
+import heapq
+import json
+import os
+from array import array
+
+CLUSTER_SIZE = 10
+# Border openings at least this wide get an entrance at each end instead of one in the middle
+WIDE_OPENING = 6
+
+# Abstract graph file saved next to a maze file
+def abstract_graph_filename(maze_filename="saved_maze.json"):
+    root, _ = os.path.splitext(maze_filename)
+    return root + "_hpa.json"
+
+def cluster_ids(grid, cluster_size):
+    """Cluster number of every grid index (-1 on the border), clusters numbered column by column."""
+    ids = array("i", [-1]) * grid.size
+    rows = -(-grid.height // cluster_size)
+    for x in range(grid.width):
+        base = (x + 1) * grid.stride + 1
+        column = (x // cluster_size) * rows
+        for y in range(grid.height):
+            ids[base + y] = column + y // cluster_size
+    return ids
+
+def border_segments(grid, cluster_size):
+    """Facing (inside, outside) index pairs along each border between two neighbouring clusters."""
+    for x0 in range(cluster_size, grid.width, cluster_size):
+        for y0 in range(0, grid.height, cluster_size):
+            yield [(grid.index((x0 - 1, y)), grid.index((x0, y))) for y in range(y0, min(y0 + cluster_size, grid.height))]
+    for y0 in range(cluster_size, grid.height, cluster_size):
+        for x0 in range(0, grid.width, cluster_size):
+            yield [(grid.index((x, y0 - 1)), grid.index((x, y0))) for x in range(x0, min(x0 + cluster_size, grid.width))]
+
+def cluster_search(grid, ids, source, goals=()):
+    """
+    Breadth-first search from `source` that never leaves its cluster. Returns
+    (distance, came_from) dicts over grid indices; stops early once every index
+    in `goals` is reached.
+    """
+    cells = grid.cells
+    cluster = ids[source]
+    distance = {source: 0}
+    came_from = {}
+    remaining = set(goals) - {source}
+    frontier = [source]
+    while frontier and (remaining or not goals):
+        next_frontier = []
+        for current in frontier:
+            steps = distance[current] + 1
+            for offset in grid.offsets:
+                neighbor = current + offset
+                if cells[neighbor] or ids[neighbor] != cluster or neighbor in distance:
+                    continue
+                distance[neighbor] = steps
+                came_from[neighbor] = current
+                next_frontier.append(neighbor)
+                remaining.discard(neighbor)
+        frontier = next_frontier
+    return distance, came_from
+
+def build_abstract_graph(grid, cluster_size=CLUSTER_SIZE):
+    """
+    Split the grid into cluster_size squares, place entrances on the openings
+    between neighbouring clusters and connect them: a 1-step edge across each
+    opening and, inside each cluster, an edge between every pair of entrances that
+    can reach each other with their in-cluster distance. Cached on grid.abstract_graph.
+    """
+    from route_table import grid_digest
+    cells = grid.cells
+    ids = cluster_ids(grid, cluster_size)
+    edges = {}
+    entrances = {}
+    for segment in border_segments(grid, cluster_size):
+        runs = [[]]
+        for inside, outside in segment:
+            if cells[inside] or cells[outside]:
+                runs.append([])
+            else:
+                runs[-1].append((inside, outside))
+        for run in runs:
+            if not run:
+                continue
+            picks = [run[0], run[-1]] if len(run) >= WIDE_OPENING else [run[len(run) // 2]]
+            for inside, outside in picks:
+                edges.setdefault(inside, {})[outside] = 1
+                edges.setdefault(outside, {})[inside] = 1
+                entrances.setdefault(ids[inside], set()).add(inside)
+                entrances.setdefault(ids[outside], set()).add(outside)
+
+    for members in entrances.values():
+        for entrance in members:
+            distance, _ = cluster_search(grid, ids, entrance, members)
+            for other in members:
+                if other != entrance and other in distance:
+                    edges[entrance][other] = distance[other]
+
+    graph = {"cluster_size": cluster_size, "digest": grid_digest(grid), "ids": ids,
+             "edges": edges, "entrances": {cluster: sorted(members) for cluster, members in entrances.items()}}
+    grid.abstract_graph = graph
+    return graph
+
+def save_abstract_graph(graph, grid, filename):
+    data = {
+        "width": grid.width,
+        "height": grid.height,
+        "cluster_size": graph["cluster_size"],
+        "grid_digest": graph["digest"],
+        "edges": [[u, v, cost] for u, targets in graph["edges"].items() for v, cost in targets.items()],
+    }
+    with open(filename, "w") as file:
+        json.dump(data, file)
+
+def load_abstract_graph(filename, grid):
+    """Load a saved graph for `grid`; returns None if it is missing or was built for a different layout."""
+    from route_table import grid_digest
+    if not os.path.exists(filename):
+        return None
+    with open(filename, "r") as file:
+        data = json.load(file)
+    if (data["width"], data["height"]) != (grid.width, grid.height) or data["grid_digest"] != grid_digest(grid):
+        return None
+    ids = cluster_ids(grid, data["cluster_size"])
+    edges = {}
+    entrances = {}
+    for u, v, cost in data["edges"]:
+        edges.setdefault(u, {})[v] = cost
+        entrances.setdefault(ids[u], set()).add(u)
+    graph = {"cluster_size": data["cluster_size"], "digest": data["grid_digest"], "ids": ids,
+             "edges": edges, "entrances": {cluster: sorted(members) for cluster, members in entrances.items()}}
+    grid.abstract_graph = graph
+    return graph
+
+def abstract_graph_for(grid):
+    """
+    The grid's abstract graph: the one cached on it, else the one saved next to its
+    maze file if that still matches the layout, else a new one (kept in memory only;
+    the file is rewritten when the maze is saved).
+    """
+    if grid.abstract_graph is None:
+        if grid.filename is None or load_abstract_graph(abstract_graph_filename(grid.filename), grid) is None:
+            build_abstract_graph(grid)
+    return grid.abstract_graph
+
+def load_or_build_abstract_graph(grid, maze_filename="saved_maze.json", cluster_size=CLUSTER_SIZE):
+    """Use the graph saved next to the maze when it is current, otherwise rebuild and save it."""
+    filename = abstract_graph_filename(maze_filename)
+    graph = load_abstract_graph(filename, grid)
+    if graph is None or graph["cluster_size"] != cluster_size:
+        graph = build_abstract_graph(grid, cluster_size)
+        save_abstract_graph(graph, grid, filename)
+    return graph
+
+def hierarchical_search(grid, start, target):
+    """
+    Return a path from start to target (both included), or [] if unreachable.
+    Searches the entrance graph first, then refines each abstract edge with a
+    search inside one cluster. Paths may be slightly longer than optimal.
+    """
+    grid.stats = {"expansions": 0, "pushes": 0, "stale_pops": 0}
+    if not grid.in_bounds(start) or not grid.in_bounds(target):
+        return []
+    graph = abstract_graph_for(grid)
+    ids = graph["ids"]
+    edges = graph["edges"]
+    stride = grid.stride
+    source = grid.index(start)
+    goal = grid.index(target)
+    if source == goal:
+        return [start]
+    if grid.cells[goal]:
+        return []
+    if grid.cells[source]:
+        # A start inside a wall may still step out of it, like A*: continue from the best free neighbour
+        best = []
+        for offset in grid.offsets:
+            if not grid.cells[source + offset]:
+                path = hierarchical_search(grid, grid.coords(source + offset), target)
+                if path and (not best or len(path) < len(best)):
+                    best = path
+        return [start] + best if best else []
+
+    # Connect start and target to the entrances of their own clusters
+    start_members = graph["entrances"].get(ids[source], [])
+    distance, _ = cluster_search(grid, ids, source, start_members + [goal])
+    start_edges = {entrance: distance[entrance] for entrance in start_members if entrance in distance}
+    if goal in distance:
+        start_edges[goal] = distance[goal]
+    goal_members = graph["entrances"].get(ids[goal], [])
+    distance, _ = cluster_search(grid, ids, goal, goal_members)
+    goal_edges = {entrance: distance[entrance] for entrance in goal_members if entrance in distance}
+
+    # A* over the abstract graph
+    tx, ty = divmod(goal, stride)
+    g_score = {source: 0}
+    came_from = {}
+    closed = set()
+    open_list = [(abs(source // stride - tx) + abs(source % stride - ty), source)]
+    expansions, pushes, stale_pops = 0, 1, 0
+    while open_list:
+        _, current = heapq.heappop(open_list)
+        if current in closed:
+            stale_pops += 1
+            continue
+        closed.add(current)
+        expansions += 1
+        if current == goal:
+            break
+        neighbors = dict(edges.get(current, {}))
+        if current == source:
+            neighbors.update(start_edges)
+        if current in goal_edges:
+            neighbors[goal] = min(goal_edges[current], neighbors.get(goal, goal_edges[current]))
+        for neighbor, cost in neighbors.items():
+            tentative = g_score[current] + cost
+            if neighbor not in closed and tentative < g_score.get(neighbor, tentative + 1):
+                g_score[neighbor] = tentative
+                came_from[neighbor] = current
+                x, y = divmod(neighbor, stride)
+                heapq.heappush(open_list, (tentative + abs(x - tx) + abs(y - ty), neighbor))
+                pushes += 1
+    grid.stats = {"expansions": expansions, "pushes": pushes, "stale_pops": stale_pops}
+    if goal not in closed:
+        return []
+
+    abstract = [goal]
+    while abstract[-1] != source:
+        abstract.append(came_from[abstract[-1]])
+    abstract.reverse()
+
+    # Refine: crossings are single steps, every other edge stays inside one cluster
+    path = [source]
+    for u, v in zip(abstract, abstract[1:]):
+        if v - u in grid.offsets:
+            path.append(v)
+            continue
+        _, parents = cluster_search(grid, ids, u, (v,))
+        segment = [v]
+        while segment[-1] != u:
+            segment.append(parents[segment[-1]])
+        path.extend(reversed(segment[:-1]))
+    return [(i // stride - 1, i % stride - 1) for i in path]
+
+def main(maze_filename="saved_maze.json"):
+    from pathfinding_core import load_maze
+    grid, start, target, nodes = load_maze(maze_filename)
+    graph = load_or_build_abstract_graph(grid, maze_filename)
+    count = sum(len(targets) for targets in graph["edges"].values())
+    print(f"Abstract graph with {len(graph['edges'])} entrances and {count} edges saved to {abstract_graph_filename(maze_filename)}")
+
+if __name__ == "__main__":
+    main()
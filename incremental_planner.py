@@ -0,0 +1,142 @@
+#Incremental_replanning_(D*_Lite)_for_walls_that_change_during_navigation
+import heapq
+
+INF = float("inf")
+
+class DStarLite:
+    """
+    D* Lite (Koenig & Likhachev) on a Grid. The search runs backwards from the
+    goal and keeps its g/rhs values between calls, so after the walker moves or a
+    few walls change only the affected cells are re-expanded.
+
+    Usage: planner = DStarLite(grid, start, goal); planner.path();
+    planner.update_walls(added=[...], removed=[...]); planner.move_to(cell); planner.path()
+    """
+
+    def __init__(self, grid, start, goal):
+        self.grid = grid
+        self.stride = grid.stride
+        self.start = grid.index(start)
+        self.goal = grid.index(goal)
+        self.km = 0
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.open_list = []
+        self.queued = {}  # cell -> key it is queued with; heap entries with other keys are stale
+        self.stats = {"expansions": 0, "pushes": 0, "stale_pops": 0}
+        self.push(self.goal, self.calculate_key(self.goal))
+
+    def heuristic(self, a, b):
+        ax, ay = divmod(a, self.stride)
+        bx, by = divmod(b, self.stride)
+        return abs(ax - bx) + abs(ay - by)
+
+    def calculate_key(self, cell):
+        best = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (best + self.heuristic(self.start, cell) + self.km, best)
+
+    def push(self, cell, key):
+        self.queued[cell] = key
+        heapq.heappush(self.open_list, (key, cell))
+        self.stats["pushes"] += 1
+
+    def top_key(self):
+        while self.open_list:
+            key, cell = self.open_list[0]
+            if self.queued.get(cell) == key:
+                return key
+            heapq.heappop(self.open_list)
+            self.stats["stale_pops"] += 1
+        return (INF, INF)
+
+    def update_vertex(self, cell):
+        cells = self.grid.cells
+        if cell != self.goal:
+            best = INF
+            if not cells[cell]:
+                g = self.g
+                for offset in self.grid.offsets:
+                    neighbor = cell + offset
+                    if not cells[neighbor]:
+                        cost = g.get(neighbor, INF) + 1
+                        if cost < best:
+                            best = cost
+            self.rhs[cell] = best
+        self.queued.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self.push(cell, self.calculate_key(cell))
+
+    def compute_shortest_path(self):
+        g = self.g
+        rhs = self.rhs
+        offsets = self.grid.offsets
+        while True:
+            top = self.top_key()
+            start_key = self.calculate_key(self.start)
+            if not (top < start_key or rhs.get(self.start, INF) != g.get(self.start, INF)):
+                break
+            if top == (INF, INF):
+                break
+            _, cell = heapq.heappop(self.open_list)
+            new_key = self.calculate_key(cell)
+            if top < new_key:
+                self.push(cell, new_key)
+                continue
+            del self.queued[cell]
+            self.stats["expansions"] += 1
+            if g.get(cell, INF) > rhs.get(cell, INF):
+                g[cell] = rhs[cell]
+                for offset in offsets:
+                    self.update_vertex(cell + offset)
+            else:
+                g[cell] = INF
+                self.update_vertex(cell)
+                for offset in offsets:
+                    self.update_vertex(cell + offset)
+
+    def move_to(self, position):
+        """The walker is now at `position`; keep the search state and re-anchor the heuristic."""
+        cell = self.grid.index(position)
+        self.km += self.heuristic(self.start, cell)
+        self.start = cell
+
+    def update_walls(self, added=(), removed=()):
+        """Apply wall changes to the grid and mark only the cells around them for repair."""
+        changed = []
+        for node in added:
+            if self.grid.in_bounds(node) and not self.grid.is_wall(node):
+                self.grid.set_wall(node, True)
+                changed.append(self.grid.index(node))
+        for node in removed:
+            if self.grid.in_bounds(node) and self.grid.is_wall(node):
+                self.grid.set_wall(node, False)
+                changed.append(self.grid.index(node))
+        for cell in changed:
+            self.update_vertex(cell)
+            for offset in self.grid.offsets:
+                self.update_vertex(cell + offset)
+
+    def path(self):
+        """Repair the search and return the current path from the walker to the goal, or []."""
+        self.stats = {"expansions": 0, "pushes": 0, "stale_pops": 0}
+        self.compute_shortest_path()
+        g = self.g
+        if g.get(self.start, INF) == INF:
+            return []
+        cells = self.grid.cells
+        current = self.start
+        path = [current]
+        while current != self.goal:
+            if len(path) > self.grid.size:
+                return []  # Only reachable if the search state were inconsistent
+            best, best_cost = None, INF
+            for offset in self.grid.offsets:
+                neighbor = current + offset
+                if not cells[neighbor] and g.get(neighbor, INF) + 1 < best_cost:
+                    best, best_cost = neighbor, g.get(neighbor, INF) + 1
+            if best is None:
+                return []
+            current = best
+            path.append(current)
+        stride = self.stride
+        return [(i // stride - 1, i % stride - 1) for i in path]
@@ -0,0 +1,198 @@
+#Jump_Point_Search_(JPS+)_for_4-connected_uniform_grids
+import heapq
+from array import array
+
+# Direction indices follow Grid.offsets: 0 = x+1, 1 = x-1, 2 = y+1, 3 = y-1
+HORIZONTAL = (0, 1)
+VERTICAL = (2, 3)
+
+def build_jump_tables(grid):
+    """
+    Precompute JPS+ jump distances for every cell and direction and cache them on the grid.
+
+    Paths are pruned to a horizontal-first canonical order: a vertical move may always
+    follow a horizontal one, but a horizontal move may only follow a vertical one when
+    the corner that would allow doing it first is blocked (a forced neighbor).
+
+    tables[d][i] > 0 is the distance from cell i to the next jump point in direction d.
+    tables[d][i] <= 0 means there is none; -tables[d][i] free cells lie before the wall.
+    Vertical jump points are cells with a forced horizontal neighbor; horizontal jump
+    points are cells from which a vertical jump finds one.
+    """
+    cells = grid.cells
+    offsets = grid.offsets
+    size = grid.size
+    tables = [array("i", [0]) * size for _ in offsets]
+
+    for d in VERTICAL:
+        step = offsets[d]
+        table = tables[d]
+        # Fill from the far end so the next cell's value is always known
+        order = range(size - 1, -1, -1) if step > 0 else range(size)
+        for i in order:
+            n = i + step
+            if cells[i] or not 0 <= n < size or cells[n]:
+                continue
+            forced = False
+            for h in HORIZONTAL:
+                side = n + offsets[h]
+                if not cells[side] and cells[side - step]:
+                    forced = True
+                    break
+            if forced:
+                table[i] = 1
+            else:
+                nv = table[n]
+                table[i] = nv + 1 if nv > 0 else nv - 1
+
+    down, up = tables[2], tables[3]
+    for d in HORIZONTAL:
+        step = offsets[d]
+        table = tables[d]
+        order = range(size - 1, -1, -1) if step > 0 else range(size)
+        for i in order:
+            n = i + step
+            if cells[i] or not 0 <= n < size or cells[n]:
+                continue
+            if down[n] > 0 or up[n] > 0:
+                table[i] = 1
+            else:
+                nv = table[n]
+                table[i] = nv + 1 if nv > 0 else nv - 1
+
+    grid.jump_tables = tables
+    return tables
+
+def jump_value(grid, tables, i, d):
+    """Table value for cell i in direction d, worked out from the next cell (used for a walled start)."""
+    cells = grid.cells
+    step = grid.offsets[d]
+    n = i + step
+    if cells[n]:
+        return 0
+    if d in VERTICAL:
+        forced = any(not cells[n + grid.offsets[h]] and cells[n + grid.offsets[h] - step] for h in HORIZONTAL)
+    else:
+        forced = tables[2][n] > 0 or tables[3][n] > 0
+    if forced:
+        return 1
+    nv = tables[d][n]
+    return nv + 1 if nv > 0 else nv - 1
+
+def jump_successors(grid, tables, current, arrived, goal):
+    """Yield (direction, jump point, distance) for every canonical jump out of `current`."""
+    offsets = grid.offsets
+    cells = grid.cells
+    stride = grid.stride
+    cx, cy = divmod(current, stride)
+    tx, ty = divmod(goal, stride)
+
+    if arrived < 0:
+        directions = (0, 1, 2, 3)
+    elif arrived in HORIZONTAL:
+        directions = (arrived, 2, 3)
+    else:
+        directions = [arrived]
+        for h in HORIZONTAL:
+            side = current + offsets[h]
+            if not cells[side] and cells[side - offsets[arrived]]:
+                directions.append(h)
+
+    for d in directions:
+        # The tables hold nothing for wall cells, but a start placed on a wall can still move
+        value = jump_value(grid, tables, current, d) if cells[current] else tables[d][current]
+        reach = value if value > 0 else -value
+        step = offsets[d]
+
+        if d in VERTICAL:
+            # Target straight ahead in this column
+            if cx == tx and (ty - cy) * step > 0 and abs(ty - cy) <= reach:
+                yield d, goal, abs(ty - cy)
+                continue
+        elif (tx - cx) * (1 if step > 0 else -1) > 0:
+            # Target column ahead: the cell there is a jump point if the target is
+            # reachable by a straight vertical run from it
+            distance = abs(tx - cx)
+            if distance <= reach:
+                column_cell = current + distance * step
+                if ty == cy:
+                    yield d, goal, distance
+                    continue
+                vertical = tables[2 if ty > cy else 3][column_cell]
+                if vertical > 0 or -vertical >= abs(ty - cy):
+                    yield d, column_cell, distance
+                    continue
+
+        if value > 0:
+            yield d, current + value * step, value
+
+def jump_point_search(grid, start, target):
+    """Return a shortest path from start to target (both included), or [] if unreachable."""
+    grid.stats = {"expansions": 0, "pushes": 0, "stale_pops": 0}
+    if not grid.in_bounds(start) or not grid.in_bounds(target):
+        return []
+
+    tables = grid.jump_tables if grid.jump_tables is not None else build_jump_tables(grid)
+    stride = grid.stride
+    source = grid.index(start)
+    goal = grid.index(target)
+    tx, ty = divmod(goal, stride)
+    if source == goal:
+        return [start]
+
+    # Search states are (cell, arrival direction), packed as cell * 4 + direction;
+    # the start state uses direction 0 and is recognised by its cell
+    states = grid.size * 4
+    start_state = source * 4
+    g_score = {start_state: 0}
+    came_from = {}
+    closed = set()
+    open_list = [(abs(source // stride - tx) + abs(source % stride - ty)) * states + start_state]
+    expansions, pushes, stale_pops = 0, 1, 0
+    found = None
+
+    while open_list:
+        state = heapq.heappop(open_list) % states
+        if state in closed:
+            stale_pops += 1
+            continue
+        closed.add(state)
+        expansions += 1
+
+        current = state >> 2
+        if current == goal:
+            found = state
+            break
+
+        arrived = -1 if state == start_state else state & 3
+        g = g_score[state]
+        for d, jump_point, distance in jump_successors(grid, tables, current, arrived, goal):
+            next_state = jump_point * 4 + d
+            if next_state in closed:
+                continue
+            tentative_g_score = g + distance
+            if next_state not in g_score or tentative_g_score < g_score[next_state]:
+                g_score[next_state] = tentative_g_score
+                came_from[next_state] = state
+                jx, jy = divmod(jump_point, stride)
+                heapq.heappush(open_list, (tentative_g_score + abs(jx - tx) + abs(jy - ty)) * states + next_state)
+                pushes += 1
+
+    grid.stats = {"expansions": expansions, "pushes": pushes, "stale_pops": stale_pops}
+    if found is None:
+        return []
+
+    # Expand the chain of jump points back into individual cells
+    path = []
+    state = found
+    while state != start_state:
+        cell = state >> 2
+        step = grid.offsets[state & 3]
+        previous = came_from[state] >> 2
+        while cell != previous:
+            path.append(cell)
+            cell -= step
+        state = came_from[state]
+    path.append(source)
+    path.reverse()
+    return [(i // stride - 1, i % stride - 1) for i in path]
@@ -0,0 +1,132 @@
+#Packed_binary_maze_format_(.maze)_next_to_saved_maze.json
+import json
+import mmap
+import os
+import struct
+import sys
+import numpy as np
+from pathfinding_core import Grid, load_maze, encode_cost_layers
+
+# File layout (little-endian):
+#   header   magic, version, flags, width, height, start x/y, target x/y (-1 = unset),
+#            node count, node table offset
+#   grid     one bit per cell, packed column by column, (height + 7) // 8 bytes per column
+#   nodes    per node: x, y, name length, UTF-8 name
+#   costs    only with the HAS_COSTS flag: layer count, then per layer its name length,
+#            UTF-8 name and width * height uint8 values column by column; then the
+#            length of a UTF-8 JSON object of cost profiles and the object itself
+MAGIC = b"MAZE"
+VERSION = 1
+HAS_COSTS = 1
+HEADER = struct.Struct("<4sHHIIiiiiII")
+NODE = struct.Struct("<iiH")
+COUNT = struct.Struct("<H")
+LENGTH = struct.Struct("<I")
+
+def binary_filename(json_filename):
+    root, _ = os.path.splitext(json_filename)
+    return root + ".maze"
+
+def write_maze_binary(filename, grid, start, target, nodes):
+    bits = grid.to_bits()
+    node_table = bytearray()
+    for name, (x, y) in nodes.items():
+        encoded = name.encode("utf-8")
+        node_table += NODE.pack(x, y, len(encoded)) + encoded
+    start_x, start_y = start if start else (-1, -1)
+    target_x, target_y = target if target else (-1, -1)
+    cost_table = bytearray()
+    if grid.cost_layers or grid.profiles:
+        cost_table += COUNT.pack(len(grid.cost_layers))
+        for name in grid.cost_layers:
+            encoded = name.encode("utf-8")
+            cost_table += COUNT.pack(len(encoded)) + encoded + grid.cost_layer_values(name)
+        profiles = json.dumps(grid.profiles).encode("utf-8")
+        cost_table += LENGTH.pack(len(profiles)) + profiles
+    header = HEADER.pack(MAGIC, VERSION, HAS_COSTS if cost_table else 0, grid.width, grid.height, start_x, start_y,
+                         target_x, target_y, len(nodes), HEADER.size + len(bits))
+    with open(filename, "wb") as file:
+        file.write(header)
+        file.write(bits)
+        file.write(node_table)
+        file.write(cost_table)
+
+def read_header(buffer):
+    magic, version, flags, width, height, start_x, start_y, target_x, target_y, node_count, nodes_offset = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a version 1 .maze file")
+    start = (start_x, start_y) if start_x >= 0 else None
+    target = (target_x, target_y) if target_x >= 0 else None
+    return width, height, start, target, node_count, nodes_offset, flags
+
+def load_maze_binary(filename):
+    """Memory-map a .maze file; returns (grid, start, target, nodes) like load_maze()."""
+    with open(filename, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        width, height, start, target, node_count, nodes_offset, flags = read_header(buffer)
+        grid = Grid.from_bits(width, height, buffer[HEADER.size:nodes_offset])
+        nodes = {}
+        offset = nodes_offset
+        for _ in range(node_count):
+            x, y, length = NODE.unpack_from(buffer, offset)
+            offset += NODE.size
+            nodes[buffer[offset:offset + length].decode("utf-8")] = (x, y)
+            offset += length
+        if flags & HAS_COSTS:
+            layer_count, = COUNT.unpack_from(buffer, offset)
+            offset += COUNT.size
+            for _ in range(layer_count):
+                length, = COUNT.unpack_from(buffer, offset)
+                offset += COUNT.size
+                name = buffer[offset:offset + length].decode("utf-8")
+                offset += length
+                grid.set_cost_layer(name, buffer[offset:offset + width * height])
+                offset += width * height
+            length, = LENGTH.unpack_from(buffer, offset)
+            offset += LENGTH.size
+            grid.profiles.update(json.loads(buffer[offset:offset + length].decode("utf-8")))
+    return grid, start, target, nodes
+
+def load_occupancy_memmap(filename):
+    """Occupancy as a (width, height) boolean NumPy array, read through numpy.memmap."""
+    with open(filename, "rb") as file:
+        width, height, _, _, _, nodes_offset, _ = read_header(file.read(HEADER.size))
+    column_bytes = (height + 7) // 8
+    bits = np.memmap(filename, dtype=np.uint8, mode="r", offset=HEADER.size, shape=(width, column_bytes))
+    return np.unpackbits(bits, axis=1, bitorder="little")[:, :height].astype(bool)
+
+# Convert saved_maze.json to the binary format
+def export_binary(json_filename="saved_maze.json", filename=None):
+    filename = filename or binary_filename(json_filename)
+    grid, start, target, nodes = load_maze(json_filename)
+    write_maze_binary(filename, grid, start, target, nodes)
+    return filename
+
+# Convert a binary maze back to the editor's JSON schema
+def import_binary(filename, json_filename=None):
+    json_filename = json_filename or os.path.splitext(filename)[0] + ".json"
+    grid, start, target, nodes = load_maze_binary(filename)
+    maze_data = {
+        "width": grid.width,
+        "height": grid.height,
+        "walls": list(grid),
+        "start": start,
+        "target": target,
+        "nodes": nodes,
+    }
+    if grid.cost_layers:
+        maze_data["cost_layers"] = encode_cost_layers(grid)
+    if grid.profiles:
+        maze_data["profiles"] = grid.profiles
+    with open(json_filename, "w") as f:
+        json.dump(maze_data, f, indent=4)
+    return json_filename
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "saved_maze.json"
+    if filename.endswith(".maze"):
+        print(f"Maze written to {import_binary(filename)}")
+    else:
+        print(f"Maze written to {export_binary(filename)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#Headless_NumPy_rasterizer_for_maze_and_route_images
+import itertools
+import os
+import sys
+import numpy as np
+from PIL import Image
+from pathfinding_core import load_maze
+from route_table import load_route_table, build_route_table, route_table_filename, find_route
+
+# Colors of each layer; MazeRaster takes overrides for any of them
+colors = {
+    "floor": (0, 0, 0),
+    "grid": (255, 255, 255),
+    "wall": (128, 128, 128),
+    "path": (0, 255, 0),
+    "node": (128, 0, 128),
+    "start": (0, 0, 255),
+    "target": (255, 0, 0),
+    "cursor": (255, 255, 0),
+}
+
+# Images are (height, width, 3) uint8 arrays, row = y, as PIL's Image.fromarray expects
+
+def occupancy(grid):
+    """Walls of a Grid as a (height, width) bool array, without copying the cells."""
+    cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.width + 2, grid.stride)
+    return cells[1:-1, 1:-1].T.view(bool)
+
+def cell_mask(cells, width, height):
+    """(height, width) bool array, True at each (x, y) of `cells`."""
+    mask = np.zeros((height, width), dtype=bool)
+    if len(cells):
+        xs, ys = np.asarray(cells, dtype=np.intp).T
+        mask[ys, xs] = True
+    return mask
+
+def disc(cell_size):
+    """(cell_size, cell_size) bool stamp of a centred circle, like the editor's node markers."""
+    offsets = np.arange(cell_size) - cell_size // 2
+    return offsets[:, None] ** 2 + offsets[None, :] ** 2 <= (cell_size // 3) ** 2
+
+class MazeRaster:
+    """
+    Draws a maze and routes over it straight into NumPy arrays, no display needed.
+    The background (floor, optional grid lines, walls) is built once per grid: the
+    cell-level image is scaled up with np.kron and grid lines are set by slicing.
+    Each render copies it and fills the cells of every layer through a boolean mask
+    on a (height, width, cell, cell, 3) block view of the pixels, so the cost
+    depends on the image size, not on the number of cells drawn.
+    """
+
+    def __init__(self, grid, cell_size=8, grid_lines=False, layer_colors=None):
+        self.grid = grid
+        self.cell_size = cell_size
+        self.width = grid.width
+        self.height = grid.height
+        self.disc = disc(cell_size)
+        self.colors = dict(colors, **(layer_colors or {}))
+
+        walls = occupancy(grid)
+        cells = np.where(walls[..., None], np.array(self.colors["wall"], dtype=np.uint8), np.array(self.colors["floor"], dtype=np.uint8))
+        self.background = np.kron(cells, np.ones((cell_size, cell_size, 1), dtype=np.uint8))
+        if grid_lines:
+            # Lines go under the walls, as in the pygame visualizers
+            lines = np.zeros(self.background.shape[:2], dtype=bool)
+            lines[::cell_size, :] = True
+            lines[:, ::cell_size] = True
+            lines &= ~np.kron(walls, np.ones((cell_size, cell_size), dtype=bool))
+            self.background[lines] = self.colors["grid"]
+
+    def blocks(self, image):
+        """View of `image` indexed [y, x] -> that cell's (cell_size, cell_size, 3) pixels."""
+        size = self.cell_size
+        return image.reshape(self.height, size, self.width, size, 3).swapaxes(1, 2)
+
+    def fill(self, image, cells, color):
+        """Paint whole cells."""
+        self.blocks(image)[cell_mask(cells, self.width, self.height)] = color
+
+    def dot(self, image, cells, color):
+        """Paint a circle in the middle of each cell."""
+        blocks = self.blocks(image)
+        mask = cell_mask(cells, self.width, self.height)
+        stamped = blocks[mask]
+        stamped[:, self.disc] = color
+        blocks[mask] = stamped
+
+    def render(self, path=(), start=None, target=None, nodes=None, cursor=None):
+        """
+        Image of the maze with, in drawing order: the path (cells), start and target
+        (dots), named nodes (dots) and the cursor (a cell).
+        """
+        image = self.background.copy()
+        self.fill(image, path, self.colors["path"])
+        if start is not None:
+            self.dot(image, [start], self.colors["start"])
+        if target is not None:
+            self.dot(image, [target], self.colors["target"])
+        if nodes:
+            self.dot(image, list(nodes.values()), self.colors["node"])
+        if cursor is not None:
+            self.fill(image, [cursor], self.colors["cursor"])
+        return image
+
+    def frames(self, path, nodes=None):
+        """Animation frames of a point walking the path, one per step."""
+        for index in range(len(path)):
+            yield self.render(path[:index + 1], path[0], path[-1], nodes, path[index])
+
+def save_image(image, filename):
+    """Write an image array as PNG (or any format Pillow picks from the file extension)."""
+    Image.fromarray(image).save(filename)
+
+def save_route_gif(raster, path, filename, nodes=None, duration=200):
+    """Animated GIF of a route, encoded frame by frame."""
+    from gif_stream import GifWriter
+    with GifWriter(filename, duration=duration) as gif:
+        for frame in raster.frames(path, nodes):
+            gif.add_frame(frame)
+
+def render_route_previews(maze_filename="saved_maze.json", folder="route_previews", cell_size=8):
+    """
+    One PNG per pair of named nodes, <folder>/<first>__<second>.png, showing the
+    route between them. Routes come from the saved route table (built if it is
+    missing or stale). Returns the number of images written.
+    """
+    grid, _, _, nodes = load_maze(maze_filename)
+    table = load_route_table(route_table_filename(maze_filename), grid, nodes) or build_route_table(grid, nodes)
+    raster = MazeRaster(grid, cell_size)
+    os.makedirs(folder, exist_ok=True)
+    count = 0
+    for first, second in itertools.combinations(sorted(nodes), 2):
+        path = find_route(grid, nodes[first], nodes[second], nodes, table)
+        image = raster.render(path, nodes[first], nodes[second], nodes)
+        save_image(image, os.path.join(folder, f"{first}__{second}.png"))
+        count += 1
+    return count
+
+def main():
+    maze_filename = sys.argv[1] if len(sys.argv) > 1 else "saved_maze.json"
+    folder = sys.argv[2] if len(sys.argv) > 2 else "route_previews"
+    count = render_route_previews(maze_filename, folder)
+    print(f"{count} route previews saved to {folder}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#Cached_maze_background_for_the_pygame_visualizers
+import pygame
+
+# The visualizers import this module from main(), so loading them never needs pygame
+def open_display(width, height, caption="Pathfinding Visualizer"):
+    """Start pygame and open the window; returns (pygame, screen)."""
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption(caption)
+    return pygame, screen
+
+class MazeRenderer:
+    """
+    Draws a maze onto `screen` without repainting it from scratch every frame.
+    The grid lines and walls are rendered once into a background Surface, redrawn
+    only when the grid's walls change. Markers and path cells that stay on screen
+    are painted once onto a copy of it (the trail); each frame blits the trail and
+    adds the moving cursor on top.
+
+    renderer = MazeRenderer(screen, walls, colors, cell_size)
+    renderer.mark([start], colors["blue"])
+    for step in path:
+        renderer.mark([step], colors["green"])
+        renderer.show(step, colors["yellow"])
+    """
+
+    def __init__(self, screen, grid, colors, cell_size):
+        self.screen = screen
+        self.grid = grid
+        self.colors = colors
+        self.cell_size = cell_size
+        # Copy of grid.cells the background was drawn from
+        self.layout = None
+        self.background = None
+        self.trail = None
+        # Everything marked so far, replayed onto a new trail if the walls change
+        self.marks = []
+
+    def cell_rect(self, cell):
+        return pygame.Rect(cell[0] * self.cell_size, cell[1] * self.cell_size, self.cell_size, self.cell_size)
+
+    def refresh(self):
+        """Redraw the background (and the trail over it) if the walls changed since the last frame."""
+        if self.layout == self.grid.cells:
+            return
+        self.layout = bytearray(self.grid.cells)
+        width, height = self.screen.get_size()
+        self.background = pygame.Surface((width, height))
+        self.background.fill(self.colors["black"])
+
+        # Draw grid
+        for x in range(0, width, self.cell_size):
+            pygame.draw.line(self.background, self.colors["white"], (x, 0), (x, height))
+        for y in range(0, height, self.cell_size):
+            pygame.draw.line(self.background, self.colors["white"], (0, y), (width, y))
+
+        # Draw walls
+        for wall in self.grid:
+            pygame.draw.rect(self.background, self.colors["white"], self.cell_rect(wall))
+
+        self.trail = self.background.copy()
+        for cell, color in self.marks:
+            pygame.draw.rect(self.trail, color, self.cell_rect(cell))
+
+    def mark(self, cells, color):
+        """Paint cells that stay on screen from now on, over anything marked before."""
+        self.refresh()
+        for cell in cells:
+            self.marks.append((cell, color))
+            pygame.draw.rect(self.trail, color, self.cell_rect(cell))
+
+    def show(self, cursor=None, color=None):
+        """Put the trail on the screen, with the cursor cell drawn on top of it."""
+        self.refresh()
+        self.screen.blit(self.trail, (0, 0))
+        if cursor is not None:
+            pygame.draw.rect(self.screen, color, self.cell_rect(cursor))
+
+    def record_walk(self, path, filename, path_color, cursor_color, markers=(), duration=200):
+        """
+        Walk the cursor along `path`, one frame per cell: paint the markers due at that
+        step, extend the path drawn so far by the cell, show the cursor on it, and
+        append the screen to the animated GIF `filename`. `markers` are
+        (path index, cells, color), painted once the walk reaches that index.
+        Stops early if the window is closed.
+        """
+        from gif_stream import GifWriter
+        due = sorted(markers, key=lambda marker: marker[0])
+        next_marker = 0
+        # Frames are encoded to the GIF as they are captured, so memory stays flat
+        with GifWriter(filename, duration=duration) as gif:
+            for index, cell in enumerate(path):
+                while next_marker < len(due) and due[next_marker][0] <= index:
+                    _, cells, color = due[next_marker]
+                    self.mark(cells, color)
+                    next_marker += 1
+                self.mark([cell], path_color)
+                self.show(cell, cursor_color)
+                gif.add_frame(pygame.surfarray.array3d(self.screen))
+                if index == len(path) - 1:
+                    break
+                pygame.display.flip()
+
+                # Keep the window responsive and let the user quit
+                if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                    break
@@ -0,0 +1,90 @@
+#Bulk_wall_editing:_strokes,_rooms,_region_fills_and_corridor_stamps
+from collections import deque
+
+# Each tool changes a Grid in one bulk update and returns the two corners of the
+# area it touched, so the editor repaints just that rectangle.
+
+def line_cells(a, b):
+    """Cells on the Bresenham line from a to b, both included."""
+    x, y = a
+    dx, dy = abs(b[0] - x), -abs(b[1] - y)
+    step_x = 1 if b[0] > x else -1
+    step_y = 1 if b[1] > y else -1
+    error = dx + dy
+    cells = [(x, y)]
+    while (x, y) != tuple(b):
+        double = 2 * error
+        if double >= dy:
+            error += dy
+            x += step_x
+        if double <= dx:
+            error += dx
+            y += step_y
+        cells.append((x, y))
+    return cells
+
+def bounds(cells):
+    xs = [x for x, _ in cells]
+    ys = [y for _, y in cells]
+    return (min(xs), min(ys)), (max(xs), max(ys))
+
+def stroke(grid, a, b, blocked=True):
+    """Draw (or erase) walls along the segment a-b, so fast drags leave no gaps."""
+    cells = line_cells(a, b)
+    grid.set_walls(cells, blocked)
+    return bounds(cells)
+
+def stamp_room(grid, corner, other):
+    """Walls around the rectangle's edge, open floor inside. One or two cells wide, it is all wall."""
+    grid.set_rect(corner, other, True)
+    x0, x1 = sorted((corner[0], other[0]))
+    y0, y1 = sorted((corner[1], other[1]))
+    # A thin room has no inside; its inner corners would cross and set_rect would clear past the edge
+    if x1 - x0 >= 2 and y1 - y0 >= 2:
+        grid.set_rect((x0 + 1, y0 + 1), (x1 - 1, y1 - 1), False)
+    return (x0, y0), (x1, y1)
+
+def flood_region(grid, cell):
+    """Cells 4-connected to `cell` that are in the same state (all walls or all open)."""
+    cells = grid.cells
+    stride = grid.stride
+    first = grid.index(cell)
+    state = cells[first]
+    seen = {first}
+    queue = deque([first])
+    while queue:
+        current = queue.popleft()
+        for offset in grid.offsets:
+            neighbor = current + offset
+            if neighbor in seen or cells[neighbor] != state:
+                continue
+            # The border is all walls too, but it is not part of the maze
+            x, y = divmod(neighbor, stride)
+            if 1 <= x <= grid.width and 1 <= y <= grid.height:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return [grid.coords(i) for i in seen]
+
+def fill(grid, cell):
+    """Flip the region around `cell`: a wall mass becomes floor, an open area becomes wall."""
+    region = flood_region(grid, cell)
+    grid.set_walls(region, not grid.is_wall(cell))
+    return bounds(region)
+
+def stamp_corridor(grid, start, end, width=3):
+    """
+    Open corridor `width` cells wide from start towards end, walled along both
+    sides and open at the ends. It runs along whichever axis the drag mostly
+    follows, centred on the start cell.
+    """
+    low = (width - 1) // 2
+    high = width - 1 - low
+    if abs(end[0] - start[0]) >= abs(end[1] - start[1]):
+        corner, other = (start[0], start[1] - low - 1), (end[0], start[1] + high + 1)
+        inner = (start[0], start[1] - low), (end[0], start[1] + high)
+    else:
+        corner, other = (start[0] - low - 1, start[1]), (start[0] + high + 1, end[1])
+        inner = (start[0] - low, start[1]), (start[0] + high, end[1])
+    grid.set_rect(corner, other, True)
+    grid.set_rect(inner[0], inner[1], False)
+    return (min(corner[0], other[0]), min(corner[1], other[1])), (max(corner[0], other[0]), max(corner[1], other[1]))
@@ -1,7 +1,9 @@
-import pygame
-import json
-import heapq
-from PIL import Image
+import pathfinding_core
+from pathfinding_core import load_maze
+from direction_field import DirectionField
+from turn_instructions import turn_instructions, describe
+from spatial_index import NODE_RADIUS
+from node_sequence import split_near_path
 
 # Define colors
 colors = {
@@ -20,102 +22,17 @@ width, height = 600, 300
 grid_size = 70
 cell_size = width // grid_size
 
-# Initialize pygame
-pygame.init()
-screen = pygame.display.set_mode((width, height))
-pygame.display.set_caption("Pathfinding Visualizer")
-
-# Load maze data
-def load_maze(filename="saved_maze.json"):
-    with open(filename, "r") as file:
-        data = json.load(file)
-    walls = set(tuple(cell) for cell in data["walls"])
-    start = tuple(data["start"]) if data["start"] else None
-    target = tuple(data["target"]) if data["target"] else None
-    nodes = {key: tuple(value) for key, value in data.get("nodes", {}).items()}
-    return walls, start, target, nodes
-
 # A* Algorithm for pathfinding
-def a_star(walls, start, target, nodes):
-    open_list = []
-    heapq.heappush(open_list, (0, start))
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, target)}
-
-    while open_list:
-        _, current = heapq.heappop(open_list)
-
-        if current == target:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
-
-            # Intermediate nodes directly on the path
-            intermediate_nodes = [node_name for node_name, coords in nodes.items() if coords in path]
-
-            # Side nodes (nodes close to the path but not on it)
-            side_nodes = [node_name for node_name, coords in nodes.items() if coords not in path and any(heuristic(coords, p) <= 4 for p in path)]
-
-            return path, intermediate_nodes, side_nodes
-
-        for neighbor in get_neighbors(current):
-            if neighbor in walls:
-                continue
-            tentative_g_score = g_score[current] + 1
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, target)
-                heapq.heappush(open_list, (f_score[neighbor], neighbor))
-
-    return [], [], []
-
-# Manhattan Distance heuristic function
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-# Get neighboring nodes
-def get_neighbors(node):
-    x, y = node
-    neighbors = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
-    return [(nx, ny) for nx, ny in neighbors if 0 <= nx < grid_size and 0 <= ny < grid_size]
-
-# Determine movement direction
-def get_direction(reference_path, curr_node):
-    """
-    Determines the movement direction of `curr_node` based on the reference path.
-
-    Returns: "Straight", "Left", or "Right".
-    """
-    if curr_node in reference_path:
-        return "Straight"  # Node is part of the path → Straight
-
-    # Find the closest path point
-    min_distance = float("inf")
-    closest_point = None
-    for path_point in reference_path:
-        distance = heuristic(curr_node, path_point)
-        if distance < min_distance:
-            min_distance = distance
-            closest_point = path_point
-
-    if closest_point is None:
-        return "Unknown"  # Should never happen
-
-    # Determine direction based on relative position to the path
-    dx = curr_node[0] - closest_point[0]
-    dy = curr_node[1] - closest_point[1]
-
-    if abs(dx) > abs(dy):  # Greater difference in X → Left/Right
-        return "Left" if dx < 0 else "Right"
-    else:  # Greater difference in Y → Up/Down
-        return "Left" if dy < 0 else "Right"
-
-# Main function to visualize and print directions for all nodes
+def a_star(walls, start, target, nodes, radius=NODE_RADIUS):
+    path = pathfinding_core.a_star(walls, start, target)
+    if not path:
+        return [], [], []
+
+    # Nodes within radius of the path, in path order: on it (intermediate) or beside it (side)
+    intermediate_nodes, side_nodes = split_near_path(path, nodes, radius)
+
+    return path, intermediate_nodes, side_nodes
+
 def main():
     walls, start, target, nodes = load_maze()
 
@@ -124,25 +41,24 @@ def main():
         return
 
     path, intermediate_nodes, side_nodes = a_star(walls, start, target, nodes)  # Step 1: Find path
-    path_set = set(path)  # Convert path to set for fast lookup
+    direction_field = DirectionField(path, walls.width, walls.height)  # Nearest path point for every cell
 
-    # Step 2: Collect all nodes in the path or nearby (side nodes)
-    node_directions = {}  # Store directions of nodes
-
-    # Assign directions to intermediate (path) nodes
-    for node in intermediate_nodes:
-        node_directions[node] = get_direction(path_set, nodes[node])
-
-    # Assign directions to side nodes
-    for node in side_nodes:
-        node_directions[node] = get_direction(path_set, nodes[node])
+    # Step 2: Directions of all nodes in the path or nearby (side nodes), intermediate nodes first
+    node_directions = direction_field.directions({node: nodes[node] for node in intermediate_nodes + side_nodes})
 
     # Print directions
     print("\n=== Node Directions (Path & Side Nodes) ===")
     for node, direction in node_directions.items():
         print(f"{node}: {direction}")
 
+    # Turn-by-turn instructions relative to the walker's heading
+    print("\n=== Turn-by-Turn Instructions ===")
+    for instruction in turn_instructions(path, nodes):
+        print(describe(instruction))
+
     # Step 3: Pygame Visualization
+    from maze_renderer import open_display
+    pygame, screen = open_display(width, height)
     running = True
     while running:
         screen.fill(colors["black"])
@@ -0,0 +1,29 @@
+#Order_named_nodes_by_where_the_path_first_passes_them
+from spatial_index import NodeIndex, NODE_RADIUS
+
+def first_path_indices(path, nodes, radius=NODE_RADIUS, index=None):
+    """
+    For each named node, the first path index within Manhattan `radius` of it.
+    Nodes the path never comes near are left out. Pass a prebuilt NodeIndex to
+    reuse it across routes.
+    """
+    index = index or NodeIndex(nodes)
+    return index.near_path(path, radius)
+
+def get_node_sequence(path, nodes, radius=NODE_RADIUS, index=None):
+    """
+    Named nodes in the order a walker along `path` reaches them: by first path index
+    within `radius`, nodes standing exactly on that path cell first, then map order.
+    """
+    return list(first_path_indices(path, nodes, radius, index))
+
+def split_near_path(path, nodes, radius=NODE_RADIUS, index=None):
+    """
+    Named nodes within `radius` of `path`, in path order, split in two: those standing
+    on a path cell (intermediate nodes) and the rest (side nodes).
+    """
+    on_path = set(path)
+    nearby = first_path_indices(path, nodes, radius, index)
+    intermediate_nodes = [name for name in nearby if tuple(nodes[name]) in on_path]
+    side_nodes = [name for name in nearby if tuple(nodes[name]) not in on_path]
+    return intermediate_nodes, side_nodes
@@ -25,6 +25,10 @@ PADDING = 32
 v_cells, h_cells = 30, 30 # Rows and columns
 cell_size = min(width, height) // max(v_cells, h_cells)
 
+# Board size in cells, matching what draw_grid() covers (the bottom 80px hold the buttons)
+board_width = -(-width // cell_size)
+board_height = -(-(height - 80) // cell_size)
+
 # Start and target
 start = None
 target = None
@@ -45,6 +49,8 @@ def draw_button(text, x, y):
 def save_maze():
     # Save the maze layout to a JSON file
     maze_data = {
+        "width": board_width,
+        "height": board_height,
         "walls": list(walls),
         "start": start,
         "target": target,
@@ -73,6 +79,13 @@ def save_maze_image():
     pygame.image.save(maze_surface, "saved_maze.png")
     print("Maze image saved as saved_maze.png")
 
+# Map a mouse position to a board cell, or None if it falls outside the board
+def get_cell(mouse_pos):
+    x, y = mouse_pos[0] // cell_size, mouse_pos[1] // cell_size
+    if 0 <= x < board_width and 0 <= y < board_height:
+        return x, y
+    return None
+
 # Main loop
 def main():
     global start, target, walls
@@ -105,8 +118,8 @@ def main():
                 elif 20 <= mouse_pos[0] <= 140 and height - 60 <= mouse_pos[1] <= height - 20:
                     drawing_walls = not drawing_walls
                     erasing_walls = False
-                elif mouse_pos[1] < height - 60:
-                    cell_pos = (mouse_pos[0] // cell_size, mouse_pos[1] // cell_size)
+                elif get_cell(mouse_pos) is not None:
+                    cell_pos = get_cell(mouse_pos)
                     if drawing_walls:
                         walls.add(cell_pos)
                     elif erasing_walls:
@@ -119,12 +132,12 @@ def main():
 
             if event.type == pygame.MOUSEMOTION:
                 if pygame.mouse.get_pressed()[0]:  # Left-click held down
-                    mouse_pos = pygame.mouse.get_pos()
-                    cell_pos = (mouse_pos[0] // cell_size, mouse_pos[1] // cell_size)
-                    if drawing_walls:
-                        walls.add(cell_pos)
-                    elif erasing_walls:
-                        walls.discard(cell_pos)
+                    cell_pos = get_cell(pygame.mouse.get_pos())
+                    if cell_pos is not None:
+                        if drawing_walls:
+                            walls.add(cell_pos)
+                        elif erasing_walls:
+                            walls.discard(cell_pos)
 
         # Draw buttons
         draw_button("Draw Walls", 20, height - 60)
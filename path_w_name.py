@@ -1,6 +1,12 @@
 import pygame
 import json
 import sys
+from pathfinding_core import Grid
+from route_table import build_route_table, save_route_table, route_table_filename
+from maze_binary import write_maze_binary, binary_filename
+from maze_raster import MazeRaster
+from hpa_star import build_abstract_graph, save_abstract_graph, abstract_graph_filename
+from maze_tools import stroke, stamp_room, stamp_corridor, fill
 
 # Initialize Pygame
 pygame.init()
@@ -26,10 +32,14 @@ colors = {
 v_cells, h_cells = 30, 30  # Rows and columns
 cell_size = min(width, height) // max(v_cells, h_cells)
 
+# Board size in cells, matching what draw_grid() covers (the bottom 80px hold the buttons)
+board_width = -(-width // cell_size)
+board_height = -(-(height - 80) // cell_size)
+
 # Maze elements
 start = None
 target = None
-walls = set()
+walls = Grid(board_width, board_height)  # Bulk edits write straight into its cells
 nodes = {}  # Store nodes with their names and positions: {name: (x, y)}
 
 # Fonts
@@ -48,6 +58,8 @@ def draw_button(text, x, y, active):
 # Save maze
 def save_maze():
     maze_data = {
+        "width": board_width,
+        "height": board_height,
         "walls": list(walls),
         "start": start,
         "target": target,
@@ -58,41 +70,97 @@ def save_maze():
     print("Maze saved to saved_maze.json")
     save_maze_image()
 
+    # Packed binary copy for devices that load the map on a cold start
+    grid = Grid(board_width, board_height, walls)
+    write_maze_binary(binary_filename("saved_maze.json"), grid, start, target, nodes)
+    print(f"Binary maze saved to {binary_filename('saved_maze.json')}")
+
+    # Precompute routes between named nodes so navigation needs no search at runtime
+    routes_filename = route_table_filename("saved_maze.json")
+    save_route_table(build_route_table(grid, nodes), routes_filename)
+    print(f"Route table saved to {routes_filename}")
+
+    # Cluster graph for hierarchical searches, loaded on their first use
+    graph_filename = abstract_graph_filename("saved_maze.json")
+    save_abstract_graph(build_abstract_graph(grid), grid, graph_filename)
+    print(f"Cluster graph saved to {graph_filename}")
+
 def save_maze_image():
-    maze_surface = pygame.Surface((width, height - 80))
-    maze_surface.fill(colors["black"])
-
-    for x, y in walls:
-        pygame.draw.rect(maze_surface, colors["gray"], (x * cell_size, y * cell_size, cell_size, cell_size))
-    if start:
-        pygame.draw.circle(maze_surface, colors["blue"], (start[0] * cell_size + cell_size // 2, start[1] * cell_size + cell_size // 2), cell_size // 3)
-    if target:
-        pygame.draw.circle(maze_surface, colors["red"], (target[0] * cell_size + cell_size // 2, target[1] * cell_size + cell_size // 2), cell_size // 3)
-    for name, (x, y) in nodes.items():
-        pygame.draw.circle(maze_surface, colors["green"], (x * cell_size + cell_size // 2, y * cell_size + cell_size // 2), cell_size // 3)
-        text_surface = font.render(name, True, colors["white"])
-        maze_surface.blit(text_surface, (x * cell_size + cell_size // 2 - text_surface.get_width() // 2, y * cell_size + cell_size // 2 - text_surface.get_height() // 2))
+    # Walls and markers are rasterized with NumPy; only the node labels need pygame
+    raster = MazeRaster(walls, cell_size, layer_colors={"wall": colors["gray"], "node": colors["green"]})
+    image = raster.render(start=start, target=target, nodes=nodes)[:height - 80, :width]
+    maze_surface = pygame.surfarray.make_surface(image.swapaxes(0, 1))
+    for name, position in nodes.items():
+        maze_surface.blit(label_surface(name), label_rect(name, position))
 
     pygame.image.save(maze_surface, "saved_maze.png")
     print("Maze image saved as saved_maze.png")
 
+# Cached surfaces: the empty board with its grid lines, and each node's rendered name
+grid_surface = None
+label_surfaces = {}
+
+# The board, above the button row; dirty rectangles are clipped to it
+board_rect = pygame.Rect(0, 0, width, height - 80)
+button_row = pygame.Rect(0, height - 80, width, 80)
+
+def label_surface(name):
+    if name not in label_surfaces:
+        label_surfaces[name] = font.render(name, True, colors["white"])
+    return label_surfaces[name]
+
+def cell_rect(cell):
+    return pygame.Rect(cell[0] * cell_size, cell[1] * cell_size, cell_size, cell_size)
+
+def label_rect(name, cell):
+    return label_surface(name).get_rect(center=cell_rect(cell).center)
+
+# Screen area a cell's contents cover: the cell itself plus the label of a node placed there
+def cell_area(cell):
+    area = cell_rect(cell)
+    for name, position in nodes.items():
+        if position == cell:
+            area.union_ip(label_rect(name, cell))
+    return area.clip(board_rect)
+
 # Draw grid and maze elements
-def draw_grid():
-    for x in range(0, width, cell_size):
-        for y in range(0, height - 80, cell_size):
-            pygame.draw.rect(screen, colors["white"], (x, y, cell_size, cell_size), 1)
-
-def draw_maze():
-    for x, y in walls:
-        pygame.draw.rect(screen, colors["gray"], (x * cell_size, y * cell_size, cell_size, cell_size))
-    if start:
-        pygame.draw.circle(screen, colors["blue"], (start[0] * cell_size + cell_size // 2, start[1] * cell_size + cell_size // 2), cell_size // 3)
-    if target:
-        pygame.draw.circle(screen, colors["red"], (target[0] * cell_size + cell_size // 2, target[1] * cell_size + cell_size // 2), cell_size // 3)
-    for name, (x, y) in nodes.items():
-        pygame.draw.circle(screen, colors["green"], (x * cell_size + cell_size // 2, y * cell_size + cell_size // 2), cell_size // 3)
-        text_surface = font.render(name, True, colors["white"])
-        screen.blit(text_surface, (x * cell_size + cell_size // 2 - text_surface.get_width() // 2, y * cell_size + cell_size // 2 - text_surface.get_height() // 2))
+def draw_grid(area=board_rect):
+    global grid_surface
+    if grid_surface is None:
+        grid_surface = pygame.Surface(board_rect.size)
+        grid_surface.fill(colors["black"])
+        for x in range(0, width, cell_size):
+            for y in range(0, height - 80, cell_size):
+                pygame.draw.rect(grid_surface, colors["white"], (x, y, cell_size, cell_size), 1)
+    screen.blit(grid_surface, area, area)
+
+def draw_maze(area=None):
+    """Draw walls, start, target and nodes; with `area`, only what overlaps it."""
+    if area is None:
+        area_walls = walls
+    else:
+        columns = range(area.left // cell_size, (area.right - 1) // cell_size + 1)
+        rows = range(area.top // cell_size, (area.bottom - 1) // cell_size + 1)
+        area_walls = [(x, y) for x in columns for y in rows if (x, y) in walls]
+    for cell in area_walls:
+        pygame.draw.rect(screen, colors["gray"], cell_rect(cell))
+    if start and (area is None or area.colliderect(cell_rect(start))):
+        pygame.draw.circle(screen, colors["blue"], cell_rect(start).center, cell_size // 3)
+    if target and (area is None or area.colliderect(cell_rect(target))):
+        pygame.draw.circle(screen, colors["red"], cell_rect(target).center, cell_size // 3)
+    for name, position in nodes.items():
+        text_rect = label_rect(name, position)
+        if area is None or area.colliderect(cell_rect(position)) or area.colliderect(text_rect):
+            pygame.draw.circle(screen, colors["green"], cell_rect(position).center, cell_size // 3)
+            screen.blit(label_surface(name), text_rect)
+
+# Repaint just the given board rectangles
+def redraw(rects):
+    for rect in rects:
+        screen.set_clip(rect)
+        draw_grid(rect)
+        draw_maze(rect)
+    screen.set_clip(None)
 
 # Dialog box for user input
 def get_user_input(prompt):
@@ -129,32 +197,62 @@ def show_error_message(message):
     error_surface = error_font.render(message, True, colors["error"])
     screen.blit(error_surface, (width // 2 - error_surface.get_width() // 2, height // 2 - error_surface.get_height() // 2))
 
+# Map a mouse position to a board cell, or None if it falls outside the board
+def get_cell(mouse_pos):
+    x, y = mouse_pos[0] // cell_size, mouse_pos[1] // cell_size
+    if 0 <= x < board_width and 0 <= y < board_height:
+        return x, y
+    return None
+
+# Screen rectangle covering the cells between two corners (as returned by the maze_tools edits)
+def area_rect(corner, other):
+    return cell_rect(corner).union(cell_rect(other)).clip(board_rect)
+
+# Editing modes and their buttons: (mode, label, x); the Save and Target buttons act immediately
+mode_buttons = [
+    ("walls", "Draw Walls", 20),
+    ("erase", "Erase Walls", 160),
+    ("nodes", "Node Mode", 300),
+    ("start", "Start", 620),
+    ("rect", "Rectangle", 880),
+    ("fill", "Fill", 1020),
+    ("corridor", "Corridor", 1160),
+]
+
+# Button row; returns the save and target buttons and the mode buttons by mode
+def draw_buttons(mode):
+    screen.fill(colors["black"], button_row)
+    save_button = draw_button("Save Maze", 460, height - 60, False)
+    target_button = draw_button("Target", 740, height - 60, False)
+    buttons = {name: draw_button(label, x, height - 60, mode == name) for name, label, x in mode_buttons}
+    return save_button, target_button, buttons
+
 # Main loop
 def main():
     global start, target, walls, nodes
     screen.fill(colors["black"])
 
-    # Initialize buttons
-    save_button = draw_button("Save Maze", 460, height - 60, False)
-    draw_walls_button = draw_button("Draw Walls", 20, height - 60, False)
-    erase_walls_button = draw_button("Erase Walls", 160, height - 60, False)
-    node_button = draw_button("Node Mode", 300, height - 60, False)
-    start_button = draw_button("Start", 620, height - 60, False)
-    target_button = draw_button("Target", 740, height - 60, False)
+    # Mode: one of the mode_buttons names, or None
+    mode = None
 
-    # Modes
-    drawing_walls = False
-    erasing_walls = False
-    placing_nodes = False
-    setting_start = False
-    setting_target = False
+    # Initialize buttons
+    shown_mode = mode
+    save_button, target_button, buttons = draw_buttons(mode)
 
-    # Mouse button states
+    # Mouse button states: the cell a drag started on and the last cell a stroke reached
     mouse_down = False
+    drag_start = None
+    last_cell = None
+
+    # Only what changed is repainted: the whole window after a dialog, otherwise the
+    # board rectangles touched by edits and the button row when a mode changes
+    clock = pygame.time.Clock()
+    full_redraw = True
+    error_message = None
 
     while True:
-        screen.fill(colors["black"])
-        draw_grid()
+        dirty = []
+        updated = []
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -162,66 +260,80 @@ def main():
                 sys.exit()
 
             if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = event.pos
                 mouse_down = True
+                drag_start = last_cell = None
+                if error_message:
+                    error_message = None
+                    full_redraw = True
+                clicked = [name for name, button in buttons.items() if button.collidepoint(mouse_pos)]
                 if save_button.collidepoint(mouse_pos):
                     save_maze()
-                elif draw_walls_button.collidepoint(mouse_pos):
-                    drawing_walls = not drawing_walls
-                    erasing_walls = placing_nodes = setting_start = setting_target = False
-                elif erase_walls_button.collidepoint(mouse_pos):
-                    erasing_walls = not erasing_walls
-                    drawing_walls = placing_nodes = setting_start = setting_target = False
-                elif node_button.collidepoint(mouse_pos):
-                    placing_nodes = not placing_nodes
-                    drawing_walls = erasing_walls = setting_start = setting_target = False
-                elif start_button.collidepoint(mouse_pos):
-                    setting_start = not setting_start
-                    drawing_walls = erasing_walls = placing_nodes = setting_target = False
+                elif clicked:
+                    mode = None if mode == clicked[0] else clicked[0]
                 elif target_button.collidepoint(mouse_pos):
                     target_name = get_user_input("Enter Target Node Name")
+                    full_redraw = True
                     if target_name in nodes:
                         target = nodes[target_name]
                     else:
-                        show_error_message("Error: Target node not found.")
-                elif mouse_pos[1] < height - 60:
-                    cell_pos = (mouse_pos[0] // cell_size, mouse_pos[1] // cell_size)
-                    if placing_nodes:
+                        error_message = "Error: Target node not found."
+                elif get_cell(mouse_pos) is not None:
+                    cell_pos = get_cell(mouse_pos)
+                    if mode == "nodes":
                         node_name = get_user_input("Enter Node Name")
+                        full_redraw = True
                         if node_name and cell_pos not in walls and cell_pos not in nodes.values():
                             nodes[node_name] = cell_pos
-                    elif drawing_walls:
-                        walls.add(cell_pos)
-                    elif erasing_walls:
-                        walls.discard(cell_pos)
-                    elif setting_start:
+                    elif mode in ("walls", "erase"):
+                        last_cell = cell_pos
+                        dirty.append(area_rect(*stroke(walls, cell_pos, cell_pos, mode == "walls")))
+                    elif mode in ("rect", "corridor"):
+                        drag_start = cell_pos
+                    elif mode == "fill":
+                        dirty.append(area_rect(*fill(walls, cell_pos)))
+                    elif mode == "start":
+                        if start:
+                            dirty.append(cell_area(start))
                         start = cell_pos
-                        setting_start = False
+                        dirty.append(cell_area(start))
+                        mode = None
 
             elif event.type == pygame.MOUSEMOTION and mouse_down:
-                mouse_pos = pygame.mouse.get_pos()
-                if drawing_walls:
-                    cell_pos = (mouse_pos[0] // cell_size, mouse_pos[1] // cell_size)
-                    walls.add(cell_pos)
-                elif erasing_walls:
-                    cell_pos = (mouse_pos[0] // cell_size, mouse_pos[1] // cell_size)
-                    walls.discard(cell_pos)
+                # Strokes join each cell to the last one, however far the mouse moved
+                cell_pos = get_cell(event.pos)
+                if cell_pos is not None and last_cell is not None and cell_pos != last_cell:
+                    dirty.append(area_rect(*stroke(walls, last_cell, cell_pos, mode == "walls")))
+                    last_cell = cell_pos
 
             elif event.type == pygame.MOUSEBUTTONUP:
                 mouse_down = False
+                cell_pos = get_cell(event.pos)
+                if drag_start is not None and cell_pos is not None:
+                    if mode == "rect":
+                        dirty.append(area_rect(*stamp_room(walls, drag_start, cell_pos)))
+                    elif mode == "corridor":
+                        dirty.append(area_rect(*stamp_corridor(walls, drag_start, cell_pos)))
+                drag_start = last_cell = None
 
-        # Redraw buttons
-        save_button = draw_button("Save Maze", 460, height - 60, False)
-        draw_walls_button = draw_button("Draw Walls", 20, height - 60, drawing_walls)
-        erase_walls_button = draw_button("Erase Walls", 160, height - 60, erasing_walls)
-        node_button = draw_button("Node Mode", 300, height - 60, placing_nodes)
-        start_button = draw_button("Start", 620, height - 60, setting_start)
-        target_button = draw_button("Target", 740, height - 60, False)
+        # Redraw buttons when the mode changed
+        if mode != shown_mode or full_redraw:
+            shown_mode = mode
+            save_button, target_button, buttons = draw_buttons(mode)
+            updated.append(button_row)
 
-        # Draw the maze elements
-        draw_maze()
+        if full_redraw:
+            redraw([board_rect])
+            if error_message:
+                show_error_message(error_message)
+            pygame.display.flip()
+            full_redraw = False
+        elif dirty or updated:
+            redraw(dirty)
+            pygame.display.update(dirty + updated)
 
-        pygame.display.flip()
+        # No need to poll faster than the display refreshes
+        clock.tick(60)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,390 @@
+#Shared_maze_loading_and_A*_engine_used_by_every_script
+import base64
+import json
+import heapq
+import zlib
+from array import array
+from collections import OrderedDict
+from jump_point_search import jump_point_search
+from hpa_star import hierarchical_search
+from bidirectional_search import bidirectional_search
+
+# Maze settings
+# Mazes saved before "width"/"height" were recorded were always searched on a 70x70 board
+grid_size = 70
+
+# Each byte of a bit-packed column expanded to 8 occupancy bytes (bit 0 = first cell)
+bit_table = [bytes((value >> bit) & 1 for bit in range(8)) for value in range(256)]
+
+# Traversal cost profiles. Stepping onto a cell costs base + sum(weight * layer value)
+# over the grid's uint8 cost layers, never less than 1; layers a grid lacks are ignored.
+# Mazes can carry their own profiles, which take precedence over these by name.
+default_profiles = {
+    "walking": {"base": 1, "weights": {}},
+    "wheelchair": {"base": 1, "weights": {"stairs": 50}},
+    "avoid_crowds": {"base": 1, "weights": {"crowded": 2}},
+    "tactile": {"base": 2, "weights": {"tactile": -1}},
+}
+
+# Combined step costs kept per grid; the least recently used profile is dropped first
+profile_cache_size = 16
+
+# Read the board size in cells from maze data, falling back to the legacy fixed board
+def maze_dimensions(data):
+    return data.get("width", grid_size), data.get("height", grid_size)
+
+# Load maze data; walls come back as a Grid sized from the maze metadata.
+# Binary ".maze" files (see maze_binary.py) load without parsing any JSON.
+def load_maze(filename="saved_maze.json"):
+    if filename.endswith(".maze"):
+        from maze_binary import load_maze_binary
+        walls, start, target, nodes = load_maze_binary(filename)
+        walls.filename = filename
+        return walls, start, target, nodes
+    with open(filename, "r") as file:
+        data = json.load(file)
+    width, height = maze_dimensions(data)
+    walls = Grid(width, height, data["walls"])
+    start = tuple(data["start"]) if data["start"] else None
+    target = tuple(data["target"]) if data["target"] else None
+    nodes = {key: tuple(value) for key, value in data.get("nodes", {}).items()}
+    # Cost layers are width * height uint8 values, column by column, zlib-compressed and base64-encoded
+    for name, encoded in data.get("cost_layers", {}).items():
+        walls.set_cost_layer(name, zlib.decompress(base64.b64decode(encoded)))
+    walls.profiles.update(data.get("profiles", {}))
+    walls.filename = filename
+    return walls, start, target, nodes
+
+# Cost layers and profiles of a grid in the JSON maze schema
+def encode_cost_layers(grid):
+    return {name: base64.b64encode(zlib.compress(grid.cost_layer_values(name), 9)).decode("ascii") for name in grid.cost_layers}
+
+# Manhattan Distance heuristic function
+def heuristic(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+class Grid:
+    """
+    Occupancy grid stored as a flat bytearray (1 = wall) with a one-cell wall border.
+    It also behaves like the old set of wall coordinates (`in`, iteration, len), so
+    drawing code written against that set keeps working.
+
+    Cells are laid out column-major, index = (x + 1) * stride + (y + 1), so comparing
+    two indices orders them exactly like comparing (x, y) tuples. Heap entries are
+    packed into one int, f * size + index, which sorts like the old (f, (x, y))
+    tuples, so tie-breaking and the returned paths stay identical to the tuple-based
+    A*. The border means neighbor offsets never need a bounds check.
+    """
+
+    def __init__(self, width, height, walls=()):
+        self.width = width
+        self.height = height
+        self.stride = height + 2
+        self.size = (width + 2) * self.stride
+        self.cells = bytearray(b"\x01") * self.size
+        for x in range(width):
+            base = (x + 1) * self.stride + 1
+            self.cells[base:base + height] = bytes(height)
+        for x, y in walls:
+            if 0 <= x < width and 0 <= y < height:
+                self.cells[(x + 1) * self.stride + y + 1] = 1
+
+        # Same order as the old get_neighbors: (x+1, y), (x-1, y), (x, y+1), (x, y-1)
+        self.offsets = (self.stride, -self.stride, 1, -1)
+
+        # Search state, allocated on the first search and reused by every later query.
+        # Instead of clearing it between queries, each search bumps `generation`:
+        # g_score/came_from are only valid where seen == generation, and a cell is
+        # closed (already expanded) where closed == generation.
+        self.g_score = None
+        self.came_from = None
+        self.seen = None
+        self.closed = None
+        self.generation = 0
+
+        # JPS+ jump distances, built by the first jump point search on this grid
+        self.jump_tables = None
+        # HPA* cluster entrances and edges, loaded from the file saved next to the maze
+        # (`filename`, set by load_maze) or built by the first hierarchical search
+        self.abstract_graph = None
+        self.filename = None
+
+        # uint8 cost layers aligned with `cells`, the maze's own profiles and, per
+        # profile, the combined step costs (built on first use, at most
+        # profile_cache_size kept; the layers are shared)
+        self.cost_layers = {}
+        self.profiles = {}
+        self.profile_costs = OrderedDict()
+
+        # Counters of the last search: cells expanded, heap pushes, and duplicate
+        # heap entries dropped because their cell was already expanded
+        self.stats = {"expansions": 0, "pushes": 0, "stale_pops": 0}
+
+    @classmethod
+    def from_walls(cls, walls, width=grid_size, height=grid_size):
+        return cls(width, height, walls)
+
+    @classmethod
+    def from_bits(cls, width, height, bits):
+        """Build a grid from bit-packed columns, each (height + 7) // 8 bytes, as written by to_bits()."""
+        grid = cls(width, height)
+        column_bytes = (height + 7) // 8
+        expanded = b"".join(map(bit_table.__getitem__, bits[:width * column_bytes]))
+        for x in range(width):
+            base = (x + 1) * grid.stride + 1
+            grid.cells[base:base + height] = expanded[x * column_bytes * 8:x * column_bytes * 8 + height]
+        return grid
+
+    def to_bits(self):
+        """Bit-pack the interior one column at a time, first cell in the lowest bit."""
+        column_bytes = (self.height + 7) // 8
+        digits = bytes.maketrans(b"\x00\x01", b"01")
+        packed = bytearray()
+        for x in range(self.width):
+            base = (x + 1) * self.stride + 1
+            column = self.cells[base:base + self.height].translate(digits)
+            packed += int(column[::-1], 2).to_bytes(column_bytes, "little") if self.height else b""
+        return bytes(packed)
+
+    def __contains__(self, node):
+        return self.in_bounds(node) and self.cells[self.index(node)] == 1
+
+    def __iter__(self):
+        cells = self.cells
+        for x in range(self.width):
+            base = (x + 1) * self.stride + 1
+            end = base + self.height
+            i = cells.find(1, base, end)
+            while i != -1:
+                yield x, i - base
+                i = cells.find(1, i + 1, end)
+
+    def __len__(self):
+        # Every cell of the border is a wall
+        return self.cells.count(1) - 2 * (self.width + self.height + 2)
+
+    def ensure_search_state(self):
+        if self.g_score is None:
+            self.g_score = array("i", [0]) * self.size
+            self.came_from = array("i", [-1]) * self.size
+            self.seen = array("i", [0]) * self.size
+            self.closed = array("i", [0]) * self.size
+
+    def set_wall(self, node, blocked=True):
+        """Set or clear one cell; a cell outside the grid is skipped, keeping the border walled."""
+        if not self.in_bounds(node):
+            return
+        self.cells[self.index(node)] = 1 if blocked else 0
+        self.layout_changed()
+
+    def layout_changed(self):
+        # Precomputed jump tables, cluster graph and profile step costs (whose cheapest
+        # open cell scales the heuristic) describe the old layout
+        self.jump_tables = None
+        self.abstract_graph = None
+        self.profile_costs.clear()
+
+    def set_walls(self, nodes, blocked=True):
+        """set_wall for many cells at once; cells outside the grid are skipped."""
+        value = 1 if blocked else 0
+        cells = self.cells
+        for x, y in nodes:
+            if 0 <= x < self.width and 0 <= y < self.height:
+                cells[(x + 1) * self.stride + y + 1] = value
+        self.layout_changed()
+
+    def set_rect(self, corner, other, blocked=True):
+        """Set or clear the rectangle between two corners (both included), one column slice at a time."""
+        x0, x1 = max(min(corner[0], other[0]), 0), min(max(corner[0], other[0]), self.width - 1)
+        y0, y1 = max(min(corner[1], other[1]), 0), min(max(corner[1], other[1]), self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return
+        column = (b"\x01" if blocked else b"\x00") * (y1 - y0 + 1)
+        for x in range(x0, x1 + 1):
+            base = (x + 1) * self.stride + y0 + 1
+            self.cells[base:base + len(column)] = column
+        self.layout_changed()
+
+    def set_cost_layer(self, name, values):
+        """Add or replace a cost layer given as width * height uint8 values, column by column."""
+        layer = bytearray(self.size)
+        for x in range(self.width):
+            base = (x + 1) * self.stride + 1
+            layer[base:base + self.height] = values[x * self.height:(x + 1) * self.height]
+        self.cost_layers[name] = layer
+        self.profile_costs.clear()
+
+    def cost_layer_values(self, name):
+        """A cost layer as width * height bytes, column by column (the stored form)."""
+        layer = self.cost_layers[name]
+        return b"".join(layer[(x + 1) * self.stride + 1:(x + 1) * self.stride + 1 + self.height] for x in range(self.width))
+
+    def step_costs(self, profile):
+        """
+        (cost of stepping onto each grid index, smallest such cost) for a profile name
+        or {"base", "weights"} dict. Built once per profile and reused.
+        """
+        key = profile if isinstance(profile, str) else json.dumps(profile, sort_keys=True)
+        if key in self.profile_costs:
+            self.profile_costs.move_to_end(key)
+        else:
+            if isinstance(profile, str):
+                if profile not in self.profiles and profile not in default_profiles:
+                    raise ValueError(f"Unknown cost profile: {profile}")
+                profile = self.profiles.get(profile, default_profiles.get(profile))
+            costs = [profile.get("base", 1)] * self.size
+            for name, weight in profile.get("weights", {}).items():
+                layer = self.cost_layers.get(name)
+                if layer is not None and weight:
+                    costs = [cost + weight * value for cost, value in zip(costs, layer)]
+            costs = [max(cost, 1) for cost in costs]
+            # g-scores are int32 too, so even a path through every cell must fit
+            if max(costs) > (2 ** 31 - 1) // self.size:
+                raise ValueError("Cost profile base and weights are too large for this grid")
+            costs = array("i", costs)
+            free = [cost for cost, wall in zip(costs, self.cells) if not wall]
+            self.profile_costs[key] = (costs, min(free, default=1))
+            while len(self.profile_costs) > profile_cache_size:
+                self.profile_costs.popitem(last=False)
+        return self.profile_costs[key]
+
+    def in_bounds(self, node):
+        return 0 <= node[0] < self.width and 0 <= node[1] < self.height
+
+    def index(self, node):
+        return (node[0] + 1) * self.stride + node[1] + 1
+
+    def coords(self, index):
+        x, y = divmod(index, self.stride)
+        return x - 1, y - 1
+
+    def is_wall(self, node):
+        return not self.in_bounds(node) or self.cells[self.index(node)] == 1
+
+    def a_star(self, start, target):
+        """Return the A* path from start to target (both included), or [] if unreachable."""
+        return self.search(start, target)
+
+    def weighted_a_star(self, start, target, profile):
+        """
+        A* where stepping onto a cell costs what `profile` says (see step_costs). The
+        Manhattan heuristic is scaled by the profile's cheapest step, so it stays
+        admissible and the path is the cheapest one. Returns [] if unreachable.
+        """
+        if not self.in_bounds(start) or not self.in_bounds(target):
+            self.stats = {"expansions": 0, "pushes": 0, "stale_pops": 0}
+            return []
+        costs, min_cost = self.step_costs(profile)
+        return self.search(start, target, costs, min_cost)
+
+    def search(self, start, target, costs=None, min_cost=1):
+        """
+        The A* loop behind a_star (every step costs 1, `costs` is None) and
+        weighted_a_star (stepping onto index i costs costs[i], never less than min_cost).
+        """
+        self.stats = {"expansions": 0, "pushes": 0, "stale_pops": 0}
+        if not self.in_bounds(start) or not self.in_bounds(target):
+            return []
+
+        self.ensure_search_state()
+        cells = self.cells
+        g_score = self.g_score
+        came_from = self.came_from
+        seen = self.seen
+        closed = self.closed
+        offsets = self.offsets
+        stride = self.stride
+        size = self.size
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        self.generation += 1
+        generation = self.generation
+        source = self.index(start)
+        goal = self.index(target)
+        tx, ty = divmod(goal, stride)
+
+        g_score[source] = 0
+        seen[source] = generation
+        open_list = [heuristic(start, target) * min_cost * size + source]
+        expansions, pushes, stale_pops = 0, 1, 0
+        found = False
+
+        while open_list:
+            current = heappop(open_list) % size
+            if closed[current] == generation:
+                # Duplicate entry left behind by a later, cheaper push
+                stale_pops += 1
+                continue
+            closed[current] = generation
+            expansions += 1
+
+            if current == goal:
+                found = True
+                break
+
+            current_g = g_score[current]
+            tentative_g_score = current_g + 1
+            for offset in offsets:
+                neighbor = current + offset
+                # Every step costs at least min_cost, so the scaled Manhattan distance is
+                # consistent and an expanded cell can never improve
+                if cells[neighbor] or closed[neighbor] == generation:
+                    continue
+                if costs is not None:
+                    tentative_g_score = current_g + costs[neighbor]
+                if seen[neighbor] != generation or tentative_g_score < g_score[neighbor]:
+                    seen[neighbor] = generation
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    nx, ny = divmod(neighbor, stride)
+                    heappush(open_list, (tentative_g_score + (abs(nx - tx) + abs(ny - ty)) * min_cost) * size + neighbor)
+                    pushes += 1
+
+        self.stats = {"expansions": expansions, "pushes": pushes, "stale_pops": stale_pops}
+        if not found:
+            return []
+
+        path = []
+        current = goal
+        while current != source:
+            path.append(current)
+            current = came_from[current]
+        path.append(source)
+        path.reverse()
+        return [(i // stride - 1, i % stride - 1) for i in path]
+
+    def path_cost(self, path, profile):
+        """Total cost of walking `path` (start included) under a profile."""
+        costs, _ = self.step_costs(profile)
+        return sum(costs[self.index(node)] for node in path[1:])
+
+# Search methods selectable per call
+search_methods = {
+    "astar": Grid.a_star,
+    "jps": jump_point_search,
+    "hpa": hierarchical_search,
+    "bidirectional": bidirectional_search,
+}
+
+# A* Algorithm for pathfinding
+def a_star(walls, start, target, method="astar", profile=None):
+    """
+    Find a path from start to target. `walls` may be a prebuilt Grid (preferred, so the
+    occupancy buffer and any precomputed tables are shared across queries) or a plain
+    set of wall coordinates, which is searched on the legacy grid_size x grid_size board.
+    `method` picks the search: "astar" (default), "jps" (Jump Point Search, same
+    path length, far fewer expansions on open corridors), "bidirectional" (A* from
+    both ends, same path length) or "hpa" (hierarchical search over clusters, for
+    large floors; near-optimal paths).
+    `profile` (a profile name or dict, see default_profiles) makes the search
+    weigh per-cell costs instead of counting steps; only "astar" supports it.
+    """
+    if method not in search_methods:
+        raise ValueError(f"Unknown search method: {method}")
+    grid = walls if isinstance(walls, Grid) else Grid.from_walls(walls)
+    if profile is not None:
+        if method != "astar":
+            raise ValueError(f"Search method {method} only supports uniform step costs")
+        return grid.weighted_a_star(start, target, profile)
+    return search_methods[method](grid, start, target)
@@ -0,0 +1,95 @@
+#Cache_of_routes,_node_sequences_and_directions_keyed_on_the_maze_contents
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathfinding_core import a_star
+from direction_field import DirectionField
+from node_sequence import get_node_sequence
+from route_table import find_route
+
+# Cache file saved next to a maze file
+def route_cache_filename(maze_filename="saved_maze.json"):
+    root, _ = os.path.splitext(maze_filename)
+    return root + "_route_cache.json"
+
+def maze_digest(grid, nodes):
+    """
+    Fingerprint of everything a cached route depends on: walls, cost layers,
+    profiles and named nodes. Editing and re-saving the maze changes it, so
+    entries for the old layout are simply never hit again.
+    """
+    digest = hashlib.sha1(bytes(grid.cells))
+    for name in sorted(grid.cost_layers):
+        digest.update(name.encode("utf-8"))
+        digest.update(grid.cost_layers[name])
+    digest.update(json.dumps([grid.profiles, sorted(nodes.items())], sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+def route_key(digest, start, target, profile=None):
+    profile = profile if profile is None or isinstance(profile, str) else json.dumps(profile, sort_keys=True)
+    return json.dumps([digest, list(start), list(target), profile])
+
+class RouteCache:
+    """
+    Least-recently-used cache of route results ({"path", "sequence", "directions"})
+    holding at most `capacity` entries. With a filename, entries are read from it
+    on creation and written back by save().
+    """
+
+    def __init__(self, capacity=256, filename=None):
+        self.capacity = capacity
+        self.filename = filename
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if filename and os.path.exists(filename):
+            with open(filename, "r") as file:
+                for key, value in json.load(file):
+                    self.put(key, value)
+
+    def get(self, key):
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def save(self, digest=None):
+        """Write the entries to the cache file; with `digest`, only those for that maze version."""
+        if not self.filename:
+            return
+        entries = [[key, value] for key, value in self.entries.items() if digest is None or json.loads(key)[0] == digest]
+        with open(self.filename, "w") as file:
+            json.dump(entries, file)
+
+    def route(self, grid, start, target, nodes, profile=None, routes=None, digest=None):
+        """
+        Path, node sequence and per-node directions for one query, computed on a miss.
+        Uniform-cost queries use the route table `routes` when given, which may also be
+        a function returning the table so it is only loaded on a miss. Pass `digest`
+        (from maze_digest) to skip rehashing the maze on every call.
+        """
+        key = route_key(digest or maze_digest(grid, nodes), start, target, profile)
+        cached = self.get(key)
+        if cached is not None:
+            return {"path": [tuple(node) for node in cached["path"]], "sequence": cached["sequence"], "directions": cached["directions"]}
+
+        if profile is None:
+            path = find_route(grid, start, target, nodes, routes() if callable(routes) else routes)
+        else:
+            path = a_star(grid, start, target, profile=profile)
+        result = {
+            "path": path,
+            "sequence": get_node_sequence(path, nodes),
+            "directions": DirectionField(path, grid.width, grid.height).directions(nodes),
+        }
+        self.put(key, result)
+        return result
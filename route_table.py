@@ -0,0 +1,157 @@
+#All-pairs_distance_and_next-hop_table_between_named_nodes
+import base64
+import hashlib
+import json
+import os
+import zlib
+from pathfinding_core import load_maze
+
+# Next-hop codes: 0-3 step by grid.offsets[code], AT_TARGET at the node itself
+AT_TARGET = 4
+UNREACHABLE = 255
+
+# Route table file saved next to a maze file
+def route_table_filename(maze_filename="saved_maze.json"):
+    root, _ = os.path.splitext(maze_filename)
+    return root + "_routes.json"
+
+# Fingerprint of the occupancy grid and, for route tables, the named nodes, so a table
+# built for an older layout or older node positions is never used
+def grid_digest(grid, nodes=None):
+    digest = hashlib.sha1(bytes(grid.cells))
+    if nodes is not None:
+        digest.update(json.dumps(sorted((name, list(coords)) for name, coords in nodes.items())).encode("utf-8"))
+    return digest.hexdigest()
+
+def bfs_next_hops(grid, node, targets=None):
+    """
+    Breadth-first search outward from `node`. Returns (next_hop, distance) over every
+    grid index, where next_hop[i] is the direction code of the first step from i
+    towards `node` and distance[i] is the number of steps (-1 if unreachable).
+    With a collection of grid indices `targets`, stops once all of them are reached.
+    """
+    cells = grid.cells
+    offsets = grid.offsets
+    next_hop = bytearray([UNREACHABLE]) * grid.size
+    distance = [-1] * grid.size
+
+    source = grid.index(node)
+    next_hop[source] = AT_TARGET
+    distance[source] = 0
+    frontier = [source]
+    steps = 0
+    remaining = set(targets) - {source} if targets is not None else None
+    while frontier and remaining != set():
+        steps += 1
+        next_frontier = []
+        for current in frontier:
+            for d, offset in enumerate(offsets):
+                neighbor = current + offset
+                if cells[neighbor] or next_hop[neighbor] != UNREACHABLE:
+                    continue
+                # Offsets come in opposite pairs (0, 1) and (2, 3): step back with d ^ 1
+                next_hop[neighbor] = d ^ 1
+                distance[neighbor] = steps
+                next_frontier.append(neighbor)
+                if remaining:
+                    remaining.discard(neighbor)
+        frontier = next_frontier
+    return next_hop, distance
+
+class RouteTable:
+    """Shortest distances between named nodes plus per-node next-hop maps for any start cell."""
+
+    def __init__(self, width, height, digest, names, distances, next_hops):
+        self.width = width
+        self.height = height
+        self.stride = height + 2
+        self.digest = digest
+        self.names = names
+        self.distances = distances
+        self.next_hops = next_hops
+        self.name_index = {name: i for i, name in enumerate(names)}
+
+    def distance(self, source, target):
+        """Steps between two named nodes, or -1 if there is no route."""
+        return self.distances[self.name_index[source]][self.name_index[target]]
+
+    def path(self, start, target):
+        """
+        Follow next hops from any cell `start` to the named node `target`; [] if unreachable.
+        A start on a wall steps out through its nearest open neighbour, as A* does.
+        """
+        next_hop = self.next_hops[target]
+        offsets = (self.stride, -self.stride, 1, -1)
+        if not (0 <= start[0] < self.width and 0 <= start[1] < self.height):
+            return []
+        current = (start[0] + 1) * self.stride + start[1] + 1
+        if next_hop[current] == UNREACHABLE:
+            # Walls are never reached by the BFS; an open cell here really is cut off,
+            # and so are its open neighbours
+            exits = [self.path(((current + offset) // self.stride - 1, (current + offset) % self.stride - 1), target)
+                     for offset in offsets if next_hop[current + offset] != UNREACHABLE]
+            if not exits:
+                return []
+            return [tuple(start)] + min(exits, key=len)
+        path = [current]
+        while next_hop[current] != AT_TARGET:
+            current += offsets[next_hop[current]]
+            path.append(current)
+        return [(i // self.stride - 1, i % self.stride - 1) for i in path]
+
+def build_route_table(grid, nodes):
+    names = list(nodes)
+    next_hops = {}
+    distances = []
+    for name in names:
+        next_hop, distance = bfs_next_hops(grid, nodes[name])
+        next_hops[name] = bytes(next_hop)
+        # Undirected grid: the distance from any node to `name` is read off its BFS
+        distances.append([distance[grid.index(nodes[other])] for other in names])
+    return RouteTable(grid.width, grid.height, grid_digest(grid, nodes), names, distances, next_hops)
+
+def save_route_table(table, filename):
+    data = {
+        "width": table.width,
+        "height": table.height,
+        "grid_digest": table.digest,
+        "names": table.names,
+        "distances": table.distances,
+        # Next-hop maps are mostly long runs of the same code, so they compress well
+        "next_hops": {name: base64.b64encode(zlib.compress(hops, 9)).decode("ascii") for name, hops in table.next_hops.items()},
+    }
+    with open(filename, "w") as file:
+        json.dump(data, file)
+
+def load_route_table(filename, grid=None, nodes=None):
+    """Load a saved table; returns None if it is missing or was built for a different grid or nodes."""
+    if not os.path.exists(filename):
+        return None
+    with open(filename, "r") as file:
+        data = json.load(file)
+    if grid is not None and data["grid_digest"] != grid_digest(grid, nodes):
+        return None
+    next_hops = {name: zlib.decompress(base64.b64decode(hops)) for name, hops in data["next_hops"].items()}
+    return RouteTable(data["width"], data["height"], data["grid_digest"], data["names"], data["distances"], next_hops)
+
+# Route to a named node from the table when possible, otherwise fall back to A*
+def find_route(grid, start, target, nodes, table):
+    if table is not None:
+        for name, coords in nodes.items():
+            if coords == target and name in table.next_hops:
+                path = table.path(start, name)
+                # A table that disagrees about where the node is must not be trusted
+                if path and path[-1] == tuple(target):
+                    return path
+                break
+    return grid.a_star(start, target)
+
+def main(maze_filename="saved_maze.json"):
+    grid, start, target, nodes = load_maze(maze_filename)
+    table = build_route_table(grid, nodes)
+    filename = route_table_filename(maze_filename)
+    save_route_table(table, filename)
+    print(f"Route table for {len(table.names)} nodes saved to {filename}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#Headless_asyncio_routing_service_over_a_Unix_socket_or_localhost_HTTP
+import asyncio
+import json
+import os
+import socket
+import struct
+import sys
+import time
+from pathfinding_core import load_maze
+from route_table import load_route_table, route_table_filename
+from route_cache import RouteCache, maze_digest
+from turn_instructions import turn_instructions
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Unix socket frames: 4-byte big-endian payload length, then a JSON object or, if the
+# msgpack package is installed, a msgpack map; replies use the format of the request.
+FRAME = struct.Struct(">I")
+OPS = ("route", "sequence", "directions", "instructions")
+
+class MazeState:
+    """A maze kept loaded with its route table and result cache; reloaded when the file changes."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.mtime = None
+        self.load()
+
+    def load(self):
+        self.mtime = os.stat(self.filename).st_mtime_ns
+        self.grid, self.start, self.target, self.nodes = load_maze(self.filename)
+        self.digest = maze_digest(self.grid, self.nodes)
+        table_filename = route_table_filename(self.filename)
+        self.routes = load_route_table(table_filename, self.grid, self.nodes)
+        self.cache = RouteCache(capacity=1024)
+
+    def refresh(self):
+        if os.stat(self.filename).st_mtime_ns != self.mtime:
+            self.load()
+
+    def point(self, value, default):
+        """A node name or [x, y] cell inside the maze; raises ValueError otherwise."""
+        if value is None:
+            return default
+        if isinstance(value, str):
+            if value not in self.nodes:
+                raise ValueError(f"Unknown node: {value}")
+            return self.nodes[value]
+        if (not isinstance(value, (list, tuple)) or len(value) != 2
+                or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)):
+            raise ValueError(f"Expected a node name or [x, y], got {value!r}")
+        if not self.grid.in_bounds(value):
+            raise ValueError(f"Cell {list(value)} is outside the maze")
+        return tuple(value)
+
+def check_profile(profile):
+    """None, a profile name, or {"base": int, "weights": {layer: int}}; raises ValueError otherwise."""
+    if profile is None or isinstance(profile, str):
+        return
+    if not isinstance(profile, dict) or set(profile) - {"base", "weights"}:
+        raise ValueError("Profile must be a name or an object with base and weights")
+    weights = profile.get("weights", {})
+    values = [profile.get("base", 1)] + (list(weights.values()) if isinstance(weights, dict) else [None])
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in values) or not all(isinstance(k, str) for k in weights):
+        raise ValueError("Profile base and weights must be integers")
+
+def answer(mazes, request):
+    """
+    Handle one query dict; see main() for the fields. Raises ValueError on a bad
+    request. `mazes` maps every maze file clients may ask for to its MazeState, or
+    to None until its first query; no other file is ever opened.
+    """
+    if not isinstance(request, dict):
+        raise ValueError("Query must be an object")
+    op = request.get("op", "route")
+    if op not in OPS:
+        raise ValueError(f"Unknown op: {op}")
+    filename = request.get("maze", "saved_maze.json")
+    if not isinstance(filename, str) or filename not in mazes:
+        raise ValueError(f"Unknown maze: {filename}")
+    if mazes[filename] is None:
+        mazes[filename] = MazeState(filename)
+    maze = mazes[filename]
+    maze.refresh()
+    check_profile(request.get("profile"))
+
+    start = maze.point(request.get("start"), maze.start)
+    target = maze.point(request.get("target"), maze.target)
+    if start is None or target is None:
+        raise ValueError("Start or target is missing")
+    route = maze.cache.route(maze.grid, start, target, maze.nodes, request.get("profile"), maze.routes, maze.digest)
+
+    if op == "route":
+        return {"path": route["path"]}
+    if op == "sequence":
+        return {"sequence": route["sequence"]}
+    if op == "directions":
+        return {"sequence": route["sequence"], "directions": {node: route["directions"][node] for node in route["sequence"]}}
+    return {"instructions": turn_instructions(route["path"], maze.nodes)}
+
+def timed_answer(mazes, request):
+    started = time.perf_counter()
+    try:
+        reply = answer(mazes, request)
+        reply["ok"] = True
+    except (ValueError, KeyError, TypeError, OSError) as error:
+        reply = {"ok": False, "error": str(error)}
+    except Exception as error:
+        # A query must never take its connection down with it
+        reply = {"ok": False, "error": f"Internal error: {error!r}"}
+    reply["ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return reply
+
+def decode(payload):
+    # JSON objects start with "{" (or whitespace); anything else is taken as msgpack
+    if payload[:1] in (b"{", b" ", b"\n") or msgpack is None:
+        return json.loads(payload), "json"
+    return msgpack.unpackb(payload), "msgpack"
+
+def encode(reply, kind):
+    if kind == "msgpack":
+        return msgpack.packb(reply)
+    return json.dumps(reply).encode("utf-8")
+
+async def handle_frames(mazes, reader, writer):
+    """One Unix socket client: any number of framed requests, answered in order."""
+    try:
+        while True:
+            header = await reader.readexactly(FRAME.size)
+            payload = await reader.readexactly(FRAME.unpack(header)[0])
+            try:
+                request, kind = decode(payload)
+                reply = timed_answer(mazes, request)
+            except Exception as error:
+                reply, kind = {"ok": False, "error": f"Bad request: {error}"}, "json"
+            data = encode(reply, kind)
+            writer.write(FRAME.pack(len(data)) + data)
+            await writer.drain()
+    except asyncio.IncompleteReadError:
+        pass
+    finally:
+        writer.close()
+
+async def handle_http(mazes, reader, writer):
+    """One HTTP/1.1 client: POST a JSON query to any path; keep-alive is supported."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = headers.get("content-length", "0")
+            if not length.isdigit():
+                reply = json.dumps({"ok": False, "error": "Bad request: Content-Length must be a number"}).encode("utf-8")
+                writer.write(f"HTTP/1.1 400 Bad Request\r\nContent-Type: application/json\r\nContent-Length: {len(reply)}\r\nConnection: close\r\n\r\n".encode("latin-1") + reply)
+                await writer.drain()
+                break
+            body = await reader.readexactly(int(length))
+            method = request_line.split(b" ")[0]
+            if method != b"POST":
+                status, reply = "405 Method Not Allowed", {"ok": False, "error": "POST a JSON query"}
+            else:
+                try:
+                    status, reply = "200 OK", timed_answer(mazes, json.loads(body or b"{}"))
+                except ValueError as error:
+                    status, reply = "400 Bad Request", {"ok": False, "error": f"Bad request: {error}"}
+            data = json.dumps(reply).encode("utf-8")
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(socket_path=None, port=None, host="127.0.0.1", preload=("saved_maze.json",), allowed=()):
+    """
+    Run until cancelled. Mazes in `preload` are loaded up front and those in `allowed`
+    on their first query; queries naming any other file are refused. Queries are
+    solved on the event loop, one at a time, while any number of clients wait on
+    I/O; solves are short, and the grids' search state is not shared across threads.
+    """
+    mazes = {filename: None for filename in allowed if os.path.exists(filename)}
+    mazes.update((filename, MazeState(filename)) for filename in preload if os.path.exists(filename))
+    servers = []
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        servers.append(await asyncio.start_unix_server(lambda r, w: handle_frames(mazes, r, w), path=socket_path))
+    if port is not None:
+        servers.append(await asyncio.start_server(lambda r, w: handle_http(mazes, r, w), host, port))
+    try:
+        await asyncio.gather(*(server.serve_forever() for server in servers))
+    finally:
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+# Blocking client for scripts: one framed JSON query over the Unix socket
+def query(request, socket_path="routing.sock"):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        data = json.dumps(request).encode("utf-8")
+        client.sendall(FRAME.pack(len(data)) + data)
+        header = client.recv(FRAME.size, socket.MSG_WAITALL)
+        length = FRAME.unpack(header)[0]
+        return json.loads(client.recv(length, socket.MSG_WAITALL))
+
+def main():
+    """
+    python routing_daemon.py [socket path] [http port] [maze file ...]
+    Queries are objects with "op" ("route", "sequence", "directions" or
+    "instructions"), optional "start"/"target" (cells or node names, defaulting to
+    the maze's own), "profile" (a cost profile) and "maze" (one of the maze files
+    served, default saved_maze.json, which is served unless others are listed).
+    """
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else "routing.sock"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2] else None
+    preload = sys.argv[3:] or ["saved_maze.json"]
+    print(f"Routing on {socket_path}" + (f" and http://127.0.0.1:{port}" if port is not None else ""))
+    try:
+        asyncio.run(serve(socket_path, port, preload=preload))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
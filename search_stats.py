@@ -0,0 +1,56 @@
+#Search_counters_on_saved_maze_and_generated_floors
+import random
+import time
+from pathfinding_core import load_maze, a_star, Grid
+from jump_point_search import build_jump_tables
+from hpa_star import abstract_graph_for
+
+# Build a floor of rooms separated by walls with one door per wall segment
+def generate_floor(width, height, room_size=10, seed=0):
+    rng = random.Random(seed)
+    walls = set()
+    for x in range(room_size, width, room_size):
+        for y0 in range(0, height, room_size):
+            door = y0 + rng.randrange(1, room_size - 1)
+            walls.update((x, y) for y in range(y0, min(y0 + room_size, height)) if y != door)
+    for y in range(room_size, height, room_size):
+        for x0 in range(0, width, room_size):
+            door = x0 + rng.randrange(1, room_size - 1)
+            walls.update((x, y) for x in range(x0, min(x0 + room_size, width)) if x != door)
+    return walls
+
+def random_open_cell(grid, rng):
+    while True:
+        cell = (rng.randrange(grid.width), rng.randrange(grid.height))
+        if not grid.is_wall(cell):
+            return cell
+
+def report(name, grid, queries, methods=("astar", "bidirectional", "jps", "hpa")):
+    # Jump tables and the cluster graph are built once per maze load, outside the timed queries
+    build_jump_tables(grid)
+    abstract_graph_for(grid)
+    for method in methods:
+        totals = {"expansions": 0, "pushes": 0, "stale_pops": 0}
+        started = time.perf_counter()
+        for start, target in queries:
+            a_star(grid, start, target, method=method)
+            for key in totals:
+                totals[key] += grid.stats[key]
+        elapsed = time.perf_counter() - started
+        print(f"{name} [{method}]: {len(queries)} queries in {elapsed * 1000:.1f} ms")
+        for key, value in totals.items():
+            print(f"  {key}: {value}")
+
+def main():
+    grid, start, target, nodes = load_maze()
+    named = list(nodes.values())
+    report("saved_maze.json", grid, [(a, b) for a in named for b in named if a != b])
+
+    rng = random.Random(0)
+    for size in (200, 500):
+        grid = Grid(size, size, generate_floor(size, size, seed=size))
+        queries = [(random_open_cell(grid, rng), random_open_cell(grid, rng)) for _ in range(20)]
+        report(f"generated {size}x{size} floor", grid, queries)
+
+if __name__ == "__main__":
+    main()
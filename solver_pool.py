@@ -0,0 +1,101 @@
+#Process_pool_for_batch_routes_and_route_tables_over_a_shared-memory_grid
+import os
+import random
+import time
+from multiprocessing import Pool, shared_memory
+from pathfinding_core import Grid
+from batch_routing import resolve, solve_source, group_by_source, collect, route_batch
+from route_table import bfs_next_hops, grid_digest, RouteTable
+from search_stats import generate_floor, random_open_cell
+
+# Grid attached in each worker process by attach_grid()
+worker_grid = None
+worker_memory = None
+
+def share_grid(grid):
+    """Copy the occupancy cells into a new shared memory block; the caller closes and unlinks it."""
+    memory = shared_memory.SharedMemory(create=True, size=grid.size)
+    memory.buf[:grid.size] = grid.cells
+    return memory
+
+def attach_grid(name, width, height):
+    """Pool initializer: view the parent's shared cells as this worker's Grid, without copying."""
+    global worker_grid, worker_memory
+    # Workers share the parent's resource tracker, so the block stays registered once and the parent unlinks it
+    worker_memory = shared_memory.SharedMemory(name=name)
+    worker_grid = Grid(width, height)
+    worker_grid.cells = worker_memory.buf[:worker_grid.size]
+
+def solve_chunk(chunk):
+    return [triple for source, group in chunk for triple in solve_source(worker_grid, source, group)]
+
+def source_tree(name, node, targets):
+    next_hop, distance = bfs_next_hops(worker_grid, node)
+    return name, bytes(next_hop), [distance[target] for target in targets]
+
+def run_pool(grid, processes, work):
+    """Start a pool whose workers share `grid`, and hand it to the generator `work`."""
+    memory = share_grid(grid)
+    try:
+        with Pool(processes or os.cpu_count(), attach_grid, (memory.name, grid.width, grid.height)) as pool:
+            yield from work(pool)
+    finally:
+        memory.close()
+        memory.unlink()
+
+def iter_batch_parallel(grid, pairs, nodes=None, processes=None, chunk_sources=1):
+    """
+    Solve (start, target) pairs like batch_routing.route_batch, but in a process
+    pool. Work is split by start, `chunk_sources` starts per task, and the
+    (query index, grid indices of the path, seconds) triples are yielded as soon
+    as each task finishes.
+    """
+    queries = [(resolve(start, nodes), resolve(target, nodes)) for start, target in pairs]
+    sources = list(group_by_source(queries).items())
+    chunks = [sources[i:i + chunk_sources] for i in range(0, len(sources), chunk_sources)]
+
+    def work(pool):
+        for solved in pool.imap_unordered(solve_chunk, chunks):
+            yield from solved
+    yield from run_pool(grid, processes, work)
+
+def route_batch_parallel(grid, pairs, nodes=None, processes=None, chunk_sources=1):
+    """route_batch in a process pool; returns the same BatchResult."""
+    return collect(grid.stride, len(pairs), iter_batch_parallel(grid, pairs, nodes, processes, chunk_sources))
+
+def build_route_table_parallel(grid, nodes, processes=None):
+    """route_table.build_route_table with one worker task per named node."""
+    names = list(nodes)
+    targets = [grid.index(nodes[name]) for name in names]
+    tasks = [(name, nodes[name], targets) for name in names]
+
+    def work(pool):
+        yield from pool.starmap(source_tree, tasks)
+    next_hops = {}
+    rows = {}
+    for name, next_hop, row in run_pool(grid, processes, work):
+        next_hops[name] = next_hop
+        rows[name] = row
+    return RouteTable(grid.width, grid.height, grid_digest(grid, nodes), names, [rows[name] for name in names], next_hops)
+
+def main():
+    size = 500
+    grid = Grid(size, size, generate_floor(size, size, seed=size))
+    rng = random.Random(0)
+    sources = [random_open_cell(grid, rng) for _ in range(32)]
+    pairs = [(source, random_open_cell(grid, rng)) for source in sources for _ in range(8)]
+
+    started = time.perf_counter()
+    serial = route_batch(grid, pairs)
+    serial_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parallel = route_batch_parallel(grid, pairs)
+    parallel_time = time.perf_counter() - started
+
+    same = all(serial.length(k) == parallel.length(k) for k in range(len(pairs)))
+    print(f"{len(pairs)} routes on a {size}x{size} floor: serial {serial_time * 1000:.1f} ms, "
+          f"{os.cpu_count()} processes {parallel_time * 1000:.1f} ms, same lengths: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#Uniform_bucket_grid_over_named_node_coordinates
+
+# Nodes within this Manhattan distance of the path are announced along the way
+NODE_RADIUS = 4
+
+class NodeIndex:
+    """
+    Named nodes bucketed into square cells of `bucket_size` grid cells, so proximity
+    queries only look at the few buckets around a point instead of every node.
+    """
+
+    def __init__(self, nodes, bucket_size=2 * NODE_RADIUS + 1):
+        self.nodes = nodes
+        self.bucket_size = bucket_size
+        self.order = {name: i for i, name in enumerate(nodes)}
+        self.buckets = {}
+        for name, (x, y) in nodes.items():
+            self.buckets.setdefault((x // bucket_size, y // bucket_size), []).append(name)
+
+    def candidates(self, point, radius):
+        """Names in every bucket touching the square of side 2 * radius around point."""
+        x, y = point
+        size = self.bucket_size
+        for bx in range((x - radius) // size, (x + radius) // size + 1):
+            for by in range((y - radius) // size, (y + radius) // size + 1):
+                yield from self.buckets.get((bx, by), ())
+
+    def within(self, point, radius=NODE_RADIUS):
+        """Names within Manhattan `radius` of point, in map order."""
+        x, y = point
+        found = [name for name in self.candidates(point, radius)
+                 if abs(self.nodes[name][0] - x) + abs(self.nodes[name][1] - y) <= radius]
+        return sorted(found, key=self.order.__getitem__)
+
+    def near_path(self, path, radius=NODE_RADIUS):
+        """
+        Names within Manhattan `radius` of any point of the polyline `path`, mapped to
+        the first path index that comes that close. The dict is in path order: by that
+        index, nodes standing exactly on the path cell first, then map order.
+        """
+        first = {}
+        previous_buckets = None
+        candidates = ()
+        size = self.bucket_size
+        for i, (x, y) in enumerate(path):
+            # Consecutive path cells usually share buckets; only re-gather when they change
+            buckets = ((x - radius) // size, (x + radius) // size, (y - radius) // size, (y + radius) // size)
+            if buckets != previous_buckets:
+                candidates = [name for name in self.candidates((x, y), radius) if name not in first]
+                previous_buckets = buckets
+            remaining = []
+            for name in candidates:
+                nx, ny = self.nodes[name]
+                if abs(nx - x) + abs(ny - y) <= radius:
+                    first[name] = i
+                else:
+                    remaining.append(name)
+            candidates = remaining
+
+        ordered = sorted(first, key=lambda name: (first[name], tuple(self.nodes[name]) != tuple(path[first[name]]), self.order[name]))
+        return {name: first[name] for name in ordered}
@@ -1,92 +1,15 @@
 
-import json
-import heapq
+from node_sequence import get_node_sequence
+from pathfinding_core import load_maze
+from direction_field import DirectionField
+from turn_instructions import turn_instructions, describe
+from route_table import load_route_table, route_table_filename
+from route_cache import RouteCache, route_cache_filename, maze_digest
+from incremental_planner import DStarLite
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.animation import FuncAnimation, PillowWriter
 
-def load_maze(filename="saved_maze.json"):
-    with open(filename, "r") as file:
-        data = json.load(file)
-    return (
-        set(tuple(cell) for cell in data["walls"]),
-        tuple(data["start"]) if data["start"] else None,
-        tuple(data["target"]) if data["target"] else None,
-        {key: tuple(value) for key, value in data.get("nodes", {}).items()},
-    )
-
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-def get_neighbors(node, grid_size=70):
-    x, y = node
-    neighbors = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
-    return [(nx, ny) for nx, ny in neighbors if 0 <= nx < grid_size and 0 <= ny < grid_size]
-
-def a_star(walls, start, target, nodes):
-    open_list = []
-    heapq.heappush(open_list, (0, start))
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, target)}
-
-    while open_list:
-        _, current = heapq.heappop(open_list)
-        if current == target:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
-            return path
-
-        for neighbor in get_neighbors(current):
-            if neighbor in walls:
-                continue
-            tentative_g_score = g_score[current] + 1
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, target)
-                heapq.heappush(open_list, (f_score[neighbor], neighbor))
-
-    return []
-
-def get_direction(reference_path, curr_node):
-    if curr_node in reference_path:
-        return "Straight"
-
-    min_distance = float("inf")
-    closest_point = None
-    for path_point in reference_path:
-        distance = heuristic(curr_node, path_point)
-        if distance < min_distance:
-            min_distance = distance
-            closest_point = path_point
-
-    if closest_point is None:
-        return "Unknown"
-
-    dx = curr_node[0] - closest_point[0]
-    dy = curr_node[1] - closest_point[1]
-
-    if abs(dx) > abs(dy):
-        return "Left" if dx < 0 else "Right"
-    else:
-        return "Left" if dy < 0 else "Right"
-
-def get_node_sequence(path, nodes):
-    dynamic_nodes = []
-    for step in path:
-        for name, coords in nodes.items():
-            if coords == step and name not in dynamic_nodes:
-                dynamic_nodes.append(name)
-        for name, coords in nodes.items():
-            if name not in dynamic_nodes and any(heuristic(coords, p) <= 4 for p in path[:path.index(step)+1]):
-                dynamic_nodes.append(name)
-    return dynamic_nodes
-
 def update_sequence_from_position(full_sequence, current_node, nodes):
     if current_node not in full_sequence:
         return full_sequence
@@ -140,8 +63,13 @@ def main():
         print("Start or Target is missing in the maze.")
         return
 
-    path = a_star(walls, start, target, nodes)
-    reference_path = set(path)
+    # Unchanged maze and endpoints reuse the cached route, sequence and directions;
+    # on a miss, precomputed next hops answer routes to named nodes without searching
+    digest = maze_digest(walls, nodes)
+    cache = RouteCache(filename=route_cache_filename())
+    route = cache.route(walls, start, target, nodes, routes=lambda: load_route_table(route_table_filename(), walls, nodes), digest=digest)
+    cache.save(digest)
+    path = route["path"]
     
     # Find target node name
     target_node = find_target_node(target, nodes)
@@ -150,13 +78,18 @@ def main():
         return
     
     # Get initial complete sequence
-    full_sequence = get_node_sequence(path, nodes)
-    node_directions = {node: get_direction(reference_path, nodes[node]) for node in full_sequence}
+    full_sequence = route["sequence"]
+    node_directions = {node: route["directions"][node] for node in full_sequence}
     
     # Show initial sequence
     print("\n=== Initial Node Sequence ===")
     for node in full_sequence:
         print(f"{node}: {node_directions.get(node, 'Unknown')}")
+
+    # Turn-by-turn instructions relative to the walker's heading
+    print("\n=== Turn-by-Turn Instructions ===")
+    for instruction in turn_instructions(path, nodes):
+        print(describe(instruction))
     
     # Setup visualization
     fig, ax = plt.subplots(figsize=(12, 8))
@@ -164,18 +97,43 @@ def main():
     
     # Interactive navigation
     visited_nodes = []
+    planner = None  # Created on the first wall change, then repaired incrementally
     while True:
-        print("\nEnter current node name (or 'exit' to quit):")
+        print("\nEnter current node name, 'block x y' / 'unblock x y' (or 'exit' to quit):")
         current_node = input().strip()
         
         if current_node.lower() == 'exit':
             break
+
+        command = current_node.split()
+        if len(command) == 3 and command[0] in ("block", "unblock") and all(v.lstrip("-").isdigit() for v in command[1:]):
+            cell = (int(command[1]), int(command[2]))
+            if planner is None:
+                planner = DStarLite(walls, nodes[visited_nodes[-1]] if visited_nodes else start, target)
+            if command[0] == "block":
+                planner.update_walls(added=[cell])
+            else:
+                planner.update_walls(removed=[cell])
+            new_path = planner.path()
+            if not new_path:
+                print("No route to the target with that change.")
+                continue
+            path = new_path
+            direction_field = DirectionField(path, walls.width, walls.height)
+            full_sequence = get_node_sequence(path, nodes)
+            node_directions = direction_field.directions({node: nodes[node] for node in full_sequence})
+            print(f"\n=== Rerouted ({planner.stats['expansions']} cells re-expanded) ===")
+            for instruction in turn_instructions(path, nodes):
+                print(describe(instruction))
+            continue
             
         if current_node not in nodes:
             print("Invalid node name. Please try again.")
             continue
         
         visited_nodes.append(current_node)
+        if planner is not None:
+            planner.move_to(nodes[current_node])
         updated_sequence = update_sequence_from_position(full_sequence, current_node, nodes)
         updated_sequence = updated_sequence[1:3]
         print("\n=== Updated Node Sequence ===")
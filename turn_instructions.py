@@ -0,0 +1,132 @@
+#Turn-by-turn_instructions_and_heading-relative_node_sides
+from spatial_index import NodeIndex, NODE_RADIUS
+
+# Board y grows downwards, so "north" is y - 1
+heading_names = {
+    (0, -1): "north",
+    (0, 1): "south",
+    (1, 0): "east",
+    (-1, 0): "west",
+}
+
+def compress_path(path):
+    """
+    Split a path into straight segments: dicts with the path index where each one
+    starts and ends, its heading (dx, dy) and its length in steps.
+    """
+    segments = []
+    for i in range(1, len(path)):
+        heading = (path[i][0] - path[i - 1][0], path[i][1] - path[i - 1][1])
+        if segments and segments[-1]["heading"] == heading:
+            segments[-1]["end"] = i
+            segments[-1]["length"] += 1
+        else:
+            segments.append({"start": i - 1, "end": i, "heading": heading, "length": 1})
+    return segments
+
+def turn_between(heading, new_heading):
+    # Cross product with y pointing down: positive means clockwise, i.e. a right turn
+    cross = heading[0] * new_heading[1] - heading[1] * new_heading[0]
+    if cross > 0:
+        return "right"
+    if cross < 0:
+        return "left"
+    return "straight" if heading == new_heading else "around"
+
+def relative_side(heading, offset):
+    """Where `offset` (from the walker's cell) lies for someone facing `heading`."""
+    if offset == (0, 0):
+        return "ahead"
+    lateral = heading[0] * offset[1] - heading[1] * offset[0]
+    forward = heading[0] * offset[0] + heading[1] * offset[1]
+    if abs(lateral) >= abs(forward) and lateral != 0:
+        return "right" if lateral > 0 else "left"
+    return "ahead" if forward > 0 else "behind"
+
+def node_sides(path, nodes, segments=None, radius=NODE_RADIUS, index=None):
+    """
+    For each named node within `radius` of the path: the path index where the walker
+    passes closest to it and its side ("left", "right", "ahead", "behind") relative
+    to the heading there. Returned in path order.
+    """
+    segments = segments if segments is not None else compress_path(path)
+    if not segments:
+        return {name: {"index": i, "side": "ahead"} for name, i in (index or NodeIndex(nodes)).near_path(path, radius).items()}
+
+    # Heading of travel at every path index (the last cell keeps the final heading)
+    headings = []
+    for segment in segments:
+        headings.extend([segment["heading"]] * segment["length"])
+    headings.append(segments[-1]["heading"])
+
+    sides = {}
+    for name, first in (index or NodeIndex(nodes)).near_path(path, radius).items():
+        x, y = nodes[name]
+        # Walk forward while still in range; the closest cell is where the node is passed
+        closest, best = first, abs(path[first][0] - x) + abs(path[first][1] - y)
+        i = first + 1
+        while i < len(path):
+            distance = abs(path[i][0] - x) + abs(path[i][1] - y)
+            if distance > radius:
+                break
+            if distance < best:
+                closest, best = i, distance
+            i += 1
+        offset = (x - path[closest][0], y - path[closest][1])
+        sides[name] = {"index": closest, "side": relative_side(headings[closest], offset)}
+    return dict(sorted(sides.items(), key=lambda item: item[1]["index"]))
+
+def turn_instructions(path, nodes=None, radius=NODE_RADIUS):
+    """
+    Turn-by-turn instructions for `path`, one per straight segment, plus an arrival
+    step. Each is a dict with the action ("start", "left", "right", "around" or
+    "arrive"), the heading, the distance to walk and the named nodes passed on the way
+    as (name, side) pairs. Runs in time linear in the path length.
+    """
+    segments = compress_path(path)
+    passed = {}
+    if nodes:
+        ends = [segment["end"] for segment in segments]
+        segment_index = 0
+        for name, info in node_sides(path, nodes, segments, radius).items():
+            while segment_index < len(ends) - 1 and info["index"] >= ends[segment_index]:
+                segment_index += 1
+            passed.setdefault(segment_index, []).append((name, info["side"]))
+
+    instructions = []
+    previous = None
+    for k, segment in enumerate(segments):
+        instructions.append({
+            "action": "start" if previous is None else turn_between(previous, segment["heading"]),
+            "heading": heading_names.get(segment["heading"], str(segment["heading"])),
+            "distance": segment["length"],
+            "index": segment["start"],
+            "landmarks": passed.get(k, []),
+        })
+        previous = segment["heading"]
+    if path:
+        instructions.append({
+            "action": "arrive",
+            "heading": heading_names.get(previous) if previous else None,
+            "distance": 0,
+            "index": len(path) - 1,
+            "landmarks": [],
+        })
+    return instructions
+
+def describe(instruction):
+    """Readable sentence for one instruction."""
+    action = instruction["action"]
+    if action == "arrive":
+        return "Arrive at destination"
+    steps = f"{instruction['distance']} step{'s' if instruction['distance'] != 1 else ''}"
+    if action == "start":
+        text = f"Walk {steps} {instruction['heading']}"
+    elif action == "around":
+        text = f"Turn around and walk {steps}"
+    else:
+        text = f"Turn {action} and walk {steps}"
+    if instruction["landmarks"]:
+        text += ", passing " + ", ".join(f"{name} on your {side}" if side in ("left", "right") else f"{name} straight {side}"
+                                         for name, side in instruction["landmarks"])
+    return text